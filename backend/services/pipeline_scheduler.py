@@ -10,10 +10,18 @@ Changes:
   scheduler forever -- it would see the lock, wait 30 seconds, see it again, wait again,
   indefinitely. Now if the lock exists but no pipeline_controller_v7.py process is
   running, the lock is cleared automatically and the pipeline starts fresh.
+- _is_pipeline_running() now asks the kernel instead: it tries a non-blocking
+  flock on the lock file. The controller holds that flock for the whole run and
+  the kernel drops it when the holder exits, so a held lock is never stale and
+  the file is never unlinked. Matching on "pipeline_controller_v7.py" missed
+  runs made in-process by the watcher, and unlinking their lock let a second
+  pipeline start on a fresh inode alongside them.
 - _run_pipeline() no longer uses capture_output=True -- output now flows through to
   docker logs so pipeline errors are visible instead of disappearing silently.
 """
 
+import fcntl
+import os
 import subprocess
 import threading
 import time
@@ -50,32 +58,27 @@ class PipelineScheduler:
 
     def _is_pipeline_running(self) -> bool:
         """
-        Check if the pipeline is currently running via lock file.
+        Check if the pipeline is currently running via the lock file's flock.
 
-        FIX: Previously just checked lock file existence. A stale lock left by a
-        crash or container restart would block the scheduler forever. Now we verify
-        a live pipeline_controller_v7.py process actually exists. If the lock is
-        present but no process is found, the lock is stale and gets cleared.
+        FIX: Previously checked for the file plus a pgrep for
+        pipeline_controller_v7.py, and unlinked the file if no such process was
+        found. Runs started in-process by the watcher don't match that name, so
+        their lock was deleted from under them. A lock file that exists but is
+        not flocked is just left over from a finished run and needs no cleanup.
         """
-        if not self.lock_file.exists():
-            return False
-
-        # Lock exists -- check if a live process owns it
-        result = subprocess.run(
-            ["pgrep", "-f", "pipeline_controller_v7.py"],
-            capture_output=True
-        )
-
-        if result.returncode != 0:
-            # No live process found -- stale lock
-            logger.warning("[SCHEDULER] Stale lock file detected (no live pipeline process), clearing...")
-            try:
-                self.lock_file.unlink(missing_ok=True)
-            except Exception as e:
-                logger.error(f"[SCHEDULER] Could not remove stale lock: {e}")
+        try:
+            fd = os.open(str(self.lock_file), os.O_RDONLY | os.O_CLOEXEC)
+        except FileNotFoundError:
             return False
 
-        return True
+        try:
+            fcntl.flock(fd, fcntl.LOCK_SH | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return True
+        finally:
+            # Closing the fd also releases the probe's own shared lock
+            os.close(fd)
+        return False
 
     def _run_pipeline(self):
         """
@@ -109,7 +112,6 @@ class PipelineScheduler:
         logger.info("[SCHEDULER] Starting CONTINUOUS loop mode")
 
         while self.running:
-            # Check for stale lock before waiting
             if self._is_pipeline_running():
                 logger.debug("[SCHEDULER] Pipeline already running, waiting...")
                 time.sleep(30)
@@ -141,16 +143,6 @@ class PipelineScheduler:
             logger.warning("[SCHEDULER] Already running")
             return
 
-        # Clear any stale lock at startup before the loop begins
-        if self.lock_file.exists():
-            result = subprocess.run(
-                ["pgrep", "-f", "pipeline_controller_v7.py"],
-                capture_output=True
-            )
-            if result.returncode != 0:
-                logger.warning("[SCHEDULER] Clearing stale lock file at startup...")
-                self.lock_file.unlink(missing_ok=True)
-
         self.running = True
 
         if self.mode == "continuous":
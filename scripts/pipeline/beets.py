@@ -15,11 +15,29 @@ Changes from v7.4:
 from .util import run, PRELIB, LIBRARY
 from .logging import vlog, log
 from pathlib import Path
+import os
 import time
 
+try:
+    from beets import config as beets_config
+    from beets.ui import (
+        _raw_main as beets_raw_main,
+        _open_library as beets_open_library,
+        UserError as BeetsUserError,
+    )
+    BEETS_AVAILABLE = True
+except ImportError:
+    BEETS_AVAILABLE = False
+
+# Run beet subcommands inside the pipeline process instead of spawning a
+# new interpreter per command. Each "beet" spawn pays Python startup plus
+# beets/plugin imports; in-process those are paid once per pipeline run.
+# Set BEETS_IN_PROCESS=false to go back to subprocesses.
+BEETS_IN_PROCESS = os.getenv("BEETS_IN_PROCESS", "true").lower() == "true"
+
 # FIX: These are suffix patterns for Path.suffix comparisons, NOT glob patterns.
 # Use lowercase extensions with leading dot, not "*.flac" glob syntax.
-AUDIO_EXTS = {".flac", ".mp3", ".m4a", ".ogg", ".wav", ".aac"}
+AUDIO_EXTS = frozenset({".flac", ".mp3", ".m4a", ".ogg", ".wav", ".aac"})
 
 # Glob patterns used only where Path.glob() is called
 AUDIO_GLOBS = ["**/*.flac", "**/*.mp3", "**/*.m4a", "**/*.ogg", "**/*.wav", "**/*.aac"]
@@ -29,6 +47,48 @@ AUDIO_GLOBS = ["**/*.flac", "**/*.mp3", "**/*.m4a", "**/*.ogg", "**/*.wav", "**/
 BEETS_IMPORT_LOG = "/data/last_beets_imports.log"
 
 
+def run_beet(args, lib=None):
+    """
+    Run one beet subcommand, e.g. run_beet(["update", query]).
+
+    In-process mode calls the same entry point the beet CLI uses, so config,
+    plugins and --log behave as on the command line. lib, if given, is an
+    already-open beets Library to run against. Failures are logged the way
+    run() logs a non-zero exit; they never propagate.
+    """
+    if not (BEETS_IN_PROCESS and BEETS_AVAILABLE):
+        run(["beet", *args])
+        return
+
+    try:
+        beets_raw_main(list(args), lib)
+    except BeetsUserError as e:
+        log("[BEETS] beet %s: error: %s" % (" ".join(args), e))
+    except SystemExit as e:
+        if e.code:
+            log("[BEETS] beet %s exited with code %s" % (" ".join(args), e.code))
+    except Exception as e:
+        log("[BEETS] beet %s failed: %s" % (" ".join(args), e))
+
+
+def run_beets(commands):
+    """
+    Run several beet subcommands back to back against one library handle,
+    so the database is opened once for the whole sequence rather than once
+    per command.
+    """
+    lib = None
+    if BEETS_IN_PROCESS and BEETS_AVAILABLE:
+        try:
+            lib = beets_open_library(beets_config)
+        except Exception as e:
+            # Each command opens the library itself as a fallback
+            vlog("[BEETS] Could not open shared library handle: %s" % e)
+
+    for args in commands:
+        run_beet(args, lib)
+
+
 def run_fingerprint():
     """Run AcoustID fingerprinting on all files in /pre-library."""
     vlog("[FP] Running fingerprint pass...")
@@ -58,7 +118,7 @@ def run_beets_import():
         vlog("[BEETS] No files in /pre-library to import")
         return
     try:
-        run(["beet", "import", "--quiet", "--log=%s" % BEETS_IMPORT_LOG, str(PRELIB)])
+        run_beet(["import", "--quiet", "--log=%s" % BEETS_IMPORT_LOG, str(PRELIB)])
         vlog("[BEETS] Import completed")
 
         # Diagnostic: log any files still in /pre-library (outside failed_imports)
@@ -98,11 +158,12 @@ def run_post_import():
         since = time.strftime("%Y-%m-%d", time.localtime(time.time() - 86400))
         date_query = "added:%s.." % since
 
-        vlog("[BEETS] Updating recently imported files (%s)..." % date_query)
-        run(["beet", "update", date_query])
-
-        vlog("[BEETS] Ensuring files are in correct location (%s)..." % date_query)
-        run(["beet", "move", date_query])
+        vlog("[BEETS] Updating recently imported files and ensuring they "
+             "are in the correct location (%s)..." % date_query)
+        run_beets([
+            ["update", date_query],
+            ["move", date_query],
+        ])
 
         vlog("[BEETS] Post-import completed")
     except Exception as e:
@@ -8,32 +8,45 @@ from .logging import vlog
 from .util import INBOX
 
 
-AUDIO_EXTS = {".flac", ".mp3", ".m4a", ".aac", ".ogg", ".wav"}
+AUDIO_EXTS = frozenset({".flac", ".mp3", ".m4a", ".aac", ".ogg", ".wav"})
+
+
+def is_audio_name(name: str) -> bool:
+    """Suffix test on a bare file name, without building a Path."""
+    ext = os.path.splitext(name)[1]
+    # Most names already have a lowercase suffix: only lower() on a miss
+    return ext in AUDIO_EXTS or ext.lower() in AUDIO_EXTS
 
 
 def cleanup_inbox_junk(artist_folder: Path):
     try:
-        for item in artist_folder.iterdir():
-            if item.is_file() and item.suffix.lower() not in AUDIO_EXTS:
+        with os.scandir(artist_folder) as it:
+            entries = list(it)
+        for entry in entries:
+            if entry.is_file() and not is_audio_name(entry.name):
+                # str paths straight from the DirEntry, no Path per file
+                item = entry.path
                 vlog("[CLEANUP] Removing junk file: %s" % item)
                 try:
-                    item.unlink()
+                    os.unlink(item)
                 except FileNotFoundError:
                     vlog("[CLEANUP] File disappeared: %s" % item)
                 except Exception as e:
                     vlog("[CLEANUP] Could not delete %s: %s" % (item, e))
 
-        for root, dirs, files in os.walk(artist_folder, topdown=False):
-            p = Path(root)
-            if p != artist_folder:
+        top = os.fspath(artist_folder)
+        for root, dirs, files in os.walk(top, topdown=False):
+            if root != top:
                 try:
-                    if not any(p.iterdir()):
-                        vlog("[CLEANUP] Removing empty folder: %s" % p)
-                        p.rmdir()
+                    with os.scandir(root) as it:
+                        empty = next(it, None) is None
+                    if empty:
+                        vlog("[CLEANUP] Removing empty folder: %s" % root)
+                        os.rmdir(root)
                 except FileNotFoundError:
-                    vlog("[CLEANUP] Folder disappeared: %s" % p)
+                    vlog("[CLEANUP] Folder disappeared: %s" % root)
                 except Exception as e:
-                    vlog("[CLEANUP] Could not remove %s: %s" % (p, e))
+                    vlog("[CLEANUP] Could not remove %s: %s" % (root, e))
 
     except FileNotFoundError:
         vlog("[CLEANUP] Folder disappeared during cleanup: %s" % artist_folder)
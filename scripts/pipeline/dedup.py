@@ -82,7 +82,7 @@ FORMAT_SCORE = {
     "wma":  40,
 }
 
-AUDIO_EXTS = {".flac", ".mp3", ".m4a", ".ogg", ".wav", ".aac"}
+AUDIO_EXTS = frozenset({".flac", ".mp3", ".m4a", ".ogg", ".wav", ".aac"})
 
 # Use MusicBrainz for borderline fingerprint matches
 USE_MUSICBRAINZ = os.getenv("DEDUP_USE_MUSICBRAINZ", "true").lower() == "true"
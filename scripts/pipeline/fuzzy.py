@@ -2,6 +2,7 @@
 # -*- coding: utf-8 -*-
 
 import re
+from functools import lru_cache
 
 # Stopwords filtered out before matching.
 # Keep this list small -- only truly meaningless filler words.
@@ -10,6 +11,8 @@ STOPWORDS = {
     "a", "an", "the", "and", "with", "from", "this", "that",
 }
 
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+
 # Pure numeric tokens (track numbers, years used as folder prefixes, etc.)
 # should never match against artist/album folder names. A folder called
 # "Alabama-40.Hour.Week" contains "40" as a word token; a transfer path
@@ -19,15 +22,18 @@ def _is_numeric(token: str) -> bool:
     return token.isdigit()
 
 
+# Cached: artist_in_use tokenizes the same active transfer paths once per
+# artist folder. Returns a tuple so the shared cached value is immutable.
+@lru_cache(maxsize=4096)
 def tokenize(text: str):
     text = text.lower()
-    text = re.sub(r"[^a-z0-9]+", " ", text)
-    tokens = [
+    text = _NON_ALNUM_RE.sub(" ", text)
+    tokens = tuple(
         t for t in text.split()
         if t
         and t not in STOPWORDS
         and not _is_numeric(t)   # FIX: drop pure numeric tokens (track numbers, years)
-    ]
+    )
     return tokens
 
 
@@ -45,7 +51,7 @@ def fuzzy_match(path_tokens, folder_tokens):
     """
     if not path_tokens or not folder_tokens:
         return False
-    for t in path_tokens:
-        if t in folder_tokens:
-            return True
-    return False
\ No newline at end of file
+    # set.isdisjoint runs the membership loop in C
+    if not isinstance(folder_tokens, (set, frozenset)):
+        folder_tokens = frozenset(folder_tokens)
+    return not folder_tokens.isdisjoint(path_tokens)
@@ -8,30 +8,111 @@ from .util import (
     PIPELINE_LOG,
     PIPELINE_VERBOSE_LOG,
     PIPELINE_STATUS_JSON,
+    MAX_LOG_SIZE,
 )
-import json
+import atexit
+import os
+import threading
+import time
+
+import orjson
+
+# Flush the buffer once it grows past this many bytes, or once the oldest
+# buffered line is older than LOG_FLUSH_INTERVAL seconds.
+LOG_BUFFER_SIZE = 64 * 1024
+LOG_FLUSH_INTERVAL = 0.25
+
+
+class LogWriter:
+    """
+    Buffered appender for one log file.
+
+    Keeps a single file handle open and collects lines in memory so a burst
+    of log calls becomes one write(). A timer flushes the buffer within
+    LOG_FLUSH_INTERVAL so the UI log view never lags far behind. The file size is
+    tracked in memory from the bytes written, so rotation needs no stat
+    until it is actually due.
+
+    Each flush checks that the path still names the open file. If it was
+    renamed, replaced or deleted (truncate_verbose_log.sh mv's a filtered
+    copy over it), the path is reopened so writes don't go to the orphaned
+    inode for the life of a long-running process.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._f = None
+        self._size = 0
+        self._buf = bytearray()
+        self._first = 0.0
+        self._timer = None
+        self._lock = threading.Lock()
+
+    def write(self, line: str):
+        with self._lock:
+            if not self._buf:
+                self._first = time.monotonic()
+            self._buf += (line + "\n").encode("utf-8")
+            if (len(self._buf) > LOG_BUFFER_SIZE
+                    or time.monotonic() - self._first > LOG_FLUSH_INTERVAL):
+                self._flush_locked()
+            elif self._timer is None:
+                self._timer = threading.Timer(LOG_FLUSH_INTERVAL, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._buf:
+            return
+        if self._f is not None and (self._size > MAX_LOG_SIZE or self._replaced()):
+            self._f.close()
+            self._f = None
+        if self._f is None:
+            ensure_data_dir()
+            # FIX: rotate before the buffered lines are written so they
+            # land at the start of the fresh file, not the backup.
+            rotate_if_needed(self.path)
+            self._f = open(self.path, "ab", buffering=0)
+            self._size = os.fstat(self._f.fileno()).st_size
+        self._f.write(self._buf)
+        self._size += len(self._buf)
+        self._buf.clear()
+
+    def _replaced(self) -> bool:
+        """True if self.path no longer refers to the open file."""
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return True
+        fst = os.fstat(self._f.fileno())
+        return (st.st_dev, st.st_ino) != (fst.st_dev, fst.st_ino)
+
+
+_log_writer = LogWriter(PIPELINE_LOG)
+_vlog_writer = LogWriter(PIPELINE_VERBOSE_LOG)
+atexit.register(_log_writer.flush)
+atexit.register(_vlog_writer.flush)
 
 
 def log(msg: str):
-    ensure_data_dir()
     line = "[%s] %s" % (ts(), msg)
-    print(line)
-    # FIX: rotate_if_needed renames the file, then we open fresh.
-    # Previously the line was formatted BEFORE rotate, so if rotate
-    # happened the timestamp in the line could precede the new file.
-    # Now rotate happens before the line is written, which is correct.
-    rotate_if_needed(PIPELINE_LOG)
-    with open(PIPELINE_LOG, "a", encoding="utf-8") as f:
-        f.write(line + "\n")
+    # Single write including the newline so lines from worker threads
+    # don't interleave on stdout
+    print(line + "\n", end="")
+    _log_writer.write(line)
 
 
 def vlog(msg: str):
-    ensure_data_dir()
     line = "[%s] %s" % (ts(), msg)
-    print(line)
-    rotate_if_needed(PIPELINE_VERBOSE_LOG)
-    with open(PIPELINE_VERBOSE_LOG, "a", encoding="utf-8") as f:
-        f.write(line + "\n")
+    print(line + "\n", end="")
+    _vlog_writer.write(line)
 
 
 def update_status(status: str, detail: str = "", current_artist: str = ""):
@@ -42,14 +123,13 @@ def update_status(status: str, detail: str = "", current_artist: str = ""):
         "detail": detail,
         "current_artist": current_artist,
     }
+    blob = orjson.dumps(payload, option=orjson.OPT_INDENT_2)
     # FIX: Write to a temp file then rename to avoid a partial read
     # if the API reads pipeline_status.json mid-write.
     tmp = PIPELINE_STATUS_JSON.with_suffix(".tmp")
     try:
-        with open(tmp, "w", encoding="utf-8") as f:
-            json.dump(payload, f, indent=2)
-        tmp.replace(PIPELINE_STATUS_JSON)
+        tmp.write_bytes(blob)
+        os.replace(tmp, PIPELINE_STATUS_JSON)
     except Exception:
         # Fallback: write directly if rename fails
-        with open(PIPELINE_STATUS_JSON, "w", encoding="utf-8") as f:
-            json.dump(payload, f, indent=2)
+        PIPELINE_STATUS_JSON.write_bytes(blob)
@@ -14,7 +14,10 @@ Changes from v7.6:
 
 from pathlib import Path
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+import struct
 from mutagen import File as MutagenFile
+from mutagen.id3 import ID3, ID3NoHeaderError, TALB, TPE1, TPE2
 
 from .util import INBOX
 
@@ -30,6 +33,91 @@ _FORBIDDEN_PATH_COMPONENTS = {
     "",
 }
 
+# Tag reads are mostly disk wait, so a few threads overlap them well.
+# Keep this low on spinning disks (2-4), higher is fine on SSD/NVMe.
+TAG_READ_WORKERS = 8
+
+
+# Only these tags are needed for grouping, so FLAC and MP3 are read with
+# minimal parsers instead of mutagen's full easy=True tag mapping.
+_WANTED_TAGS = ("albumartist", "artist", "album")
+_ID3_FRAMES = {"TPE2": TPE2, "TPE1": TPE1, "TALB": TALB}
+_ID3_TO_EASY = {"TPE2": "albumartist", "TPE1": "artist", "TALB": "album"}
+_FLAC_VORBIS_COMMENT = 4
+
+
+def _read_flac_tags(path: Path):
+    """
+    Read albumartist/artist/album straight from the FLAC VORBIS_COMMENT
+    block, skipping every other metadata block (pictures, seek tables).
+    Returns None if the file doesn't start with the fLaC marker.
+    """
+    with open(path, "rb") as f:
+        if f.read(4) != b"fLaC":
+            return None
+        tags = {}
+        while True:
+            header = f.read(4)
+            if len(header) < 4:
+                return tags
+            last = header[0] & 0x80
+            block_type = header[0] & 0x7F
+            length = int.from_bytes(header[1:], "big")
+            if block_type != _FLAC_VORBIS_COMMENT:
+                if last:
+                    return tags
+                f.seek(length, 1)
+                continue
+
+            block = f.read(length)
+            vendor_len, = struct.unpack_from("<I", block, 0)
+            pos = 4 + vendor_len
+            count, = struct.unpack_from("<I", block, pos)
+            pos += 4
+            for _ in range(count):
+                n, = struct.unpack_from("<I", block, pos)
+                pos += 4
+                key, _, value = block[pos:pos + n].partition(b"=")
+                pos += n
+                key = key.decode("ascii", "replace").lower()
+                if key in _WANTED_TAGS:
+                    tags.setdefault(key, []).append(
+                        value.decode("utf-8", "replace"))
+            return tags
+
+
+def _read_mp3_tags(path: Path):
+    """Parse only the TPE2/TPE1/TALB frames of an MP3's ID3 tag."""
+    try:
+        id3 = ID3(path, known_frames=_ID3_FRAMES)
+    except ID3NoHeaderError:
+        return {}
+    tags = {}
+    for frame_id, key in _ID3_TO_EASY.items():
+        frame = id3.get(frame_id)
+        if frame is not None and frame.text:
+            tags[key] = [str(t) for t in frame.text]
+    return tags
+
+
+def _read_tags(path: Path):
+    """
+    Return {tag: [values]} for the grouping tags, or None if mutagen
+    doesn't recognise the file.
+    """
+    suffix = path.suffix.lower()
+    if suffix == ".flac":
+        tags = _read_flac_tags(path)
+        if tags is not None:
+            return tags
+    elif suffix == ".mp3":
+        return _read_mp3_tags(path)
+
+    audio = MutagenFile(path, easy=True)
+    if audio is None:
+        return None
+    return dict(audio)
+
 
 def load_basic_tags(path: Path):
     """
@@ -48,12 +136,10 @@ def load_basic_tags(path: Path):
     the INBOX parent directory as a safer fallback in that case.
     """
     try:
-        audio = MutagenFile(path, easy=True)
-        if audio is None:
+        tags = _read_tags(path)
+        if tags is None:
             return path.parent.name, path.parent.name
 
-        tags = dict(audio)
-
         def get(tag):
             val = tags.get(tag, [""])
             if isinstance(val, list):
@@ -90,8 +176,14 @@ def load_basic_tags(path: Path):
 
 
 def group_files_by_album(files):
+    files = list(files)
+    if len(files) > 1:
+        with ThreadPoolExecutor(max_workers=TAG_READ_WORKERS) as pool:
+            tags = list(pool.map(load_basic_tags, files))
+    else:
+        tags = [load_basic_tags(f) for f in files]
+
     groups = defaultdict(list)
-    for f in files:
-        aa, al = load_basic_tags(f)
-        groups[(aa, al)].append(f)
+    for f, key in zip(files, tags):
+        groups[key].append(f)
     return groups
@@ -10,6 +10,7 @@ Changes from v7.6:
 """
 
 import errno
+import os
 import shutil
 import time
 from pathlib import Path
@@ -31,16 +32,73 @@ def ensure_album_folder(albumartist, album):
     return dst
 
 
+# Set once copy_file_range(2) turns out to be unusable for our mounts
+_copy_file_range_unsupported = False
+
+
+def _copy_file(src, dst):
+    """
+    copy2()-compatible copy for shutil.move's cross-device path.
+
+    Uses copy_file_range(2), which stays in the kernel and can reflink on
+    filesystems that support it. Kernels or mounts that refuse it (ENOSYS,
+    EXDEV for cross-filesystem on newer kernels, ...) fall back to
+    shutil.copyfile, i.e. sendfile(2).
+    """
+    global _copy_file_range_unsupported
+    if not _copy_file_range_unsupported:
+        try:
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                remaining = os.fstat(fsrc.fileno()).st_size
+                while remaining > 0:
+                    n = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if n == 0:
+                        break
+                    remaining -= n
+            shutil.copystat(src, dst)
+            return dst
+        except OSError as e:
+            if e.errno not in (errno.ENOSYS, errno.EXDEV, errno.EINVAL,
+                               errno.EOPNOTSUPP, errno.EBADF):
+                raise
+            _copy_file_range_unsupported = True
+            vlog("[MOVE] copy_file_range unavailable (%s), using sendfile" % e)
+    return shutil.copy2(src, dst)
+
+
+def move_path(src, dst, same_device: bool = True):
+    """
+    Move a file or folder. Same filesystem: a bare os.rename, skipping
+    shutil.move's extra isdir/exists checks. Different filesystem (the
+    usual /inbox -> tmpfs case) or separate bind mounts of one filesystem
+    (EXDEV): shutil.move with a copy_file_range(2) copy.
+
+    Callers that already know the devices differ pass same_device=False to
+    skip the rename attempt; otherwise the rename is tried first.
+    """
+    if same_device:
+        try:
+            os.rename(src, dst)
+            return
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+    shutil.move(str(src), str(dst), copy_function=_copy_file)
+
+
 def move_group_to_prelibrary(albumartist, album, files):
     dst_folder = ensure_album_folder(albumartist, album)
+    dst_dev = os.stat(dst_folder).st_dev
 
     for src in files:
-        if not src.exists():
+        # The existence check doubles as the device lookup for the fast path
+        try:
+            src_dev = os.stat(src).st_dev
+        except FileNotFoundError:
             vlog("[MOVE] File disappeared: %s" % src)
             continue
 
         dst = dst_folder / src.name
-        dst.parent.mkdir(parents=True, exist_ok=True)
 
         # Handle destination collision
         if dst.exists():
@@ -53,7 +111,7 @@ def move_group_to_prelibrary(albumartist, album, files):
             vlog("[MOVE] Destination collision, using: %s" % dst.name)
 
         try:
-            shutil.move(str(src), str(dst))
+            move_path(src, dst, src_dev == dst_dev)
         except FileNotFoundError:
             vlog("[MOVE] File vanished: %s" % src)
         except OSError as e:
@@ -68,6 +126,20 @@ def move_group_to_prelibrary(albumartist, album, files):
             log("[MOVE] Error moving %s -> %s: %s" % (src, dst, e))
 
 
+# INBOX and PRELIB don't change mid-run: compare their devices once
+_album_move_same_device = None
+
+
+def _inbox_shares_prelib_device() -> bool:
+    global _album_move_same_device
+    if _album_move_same_device is None:
+        try:
+            _album_move_same_device = os.stat(INBOX).st_dev == os.stat(PRELIB).st_dev
+        except OSError:
+            return False
+    return _album_move_same_device
+
+
 def move_existing_album_folder_to_prelibrary(src_album_folder: Path):
     if not src_album_folder.exists():
         vlog("[ALBUM-MOVE] Folder disappeared: %s" % src_album_folder)
@@ -89,7 +161,8 @@ def move_existing_album_folder_to_prelibrary(src_album_folder: Path):
         vlog("[ALBUM-MOVE] Destination exists, using: %s" % dst)
 
     try:
-        shutil.move(str(src_album_folder), str(dst))
+        # Same filesystem: the whole album directory moves with one rename
+        move_path(src_album_folder, dst, _inbox_shares_prelib_device())
     except FileNotFoundError:
         vlog("[ALBUM-MOVE] Folder vanished: %s" % src_album_folder)
     except OSError as e:
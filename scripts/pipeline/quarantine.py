@@ -13,13 +13,14 @@ Fixes:
 """
 
 import os
-import shutil
 import time
+from functools import lru_cache
 from pathlib import Path
 
 from .logging import log, vlog
+from .moves import move_path
 from .sabnzbd import sabnzbd_is_processing
-from .slskd import slskd_active_transfers, artist_in_use
+from .slskd import slskd_active_transfers, artist_in_use, build_active_index
 from .settle import folder_is_settled
 
 
@@ -35,6 +36,16 @@ def _ts_short():
     return time.strftime("%Y%m%d_%H%M%S")
 
 
+@lru_cache(maxsize=16)
+def _resolved_str(path: Path) -> str:
+    """
+    Resolve path once per process. quarantine_failed_imports_global runs on
+    every pre-library drain with the same root, and resolve() costs a
+    readlink/stat per path component.
+    """
+    return str(path.resolve())
+
+
 def qlog(msg: str):
     line = "[%s] [quarantine] %s" % (_ts(), msg)
     print(line)
@@ -58,18 +69,48 @@ def flatten_quarantine_filename(original_path: Path, timestamp: str) -> str:
     becomes:
         Artist - Album - track01 - 20240101_120000.flac
     """
-    parts = [p for p in original_path.parts if p not in ("", "/", FAILED_IMPORTS_NAME)]
+    # Plain string splitting: accepts a str or a Path without building
+    # any intermediate Path objects
+    parts = [p for p in os.fspath(original_path).split(os.sep)
+             if p not in ("", FAILED_IMPORTS_NAME)]
     # Keep extension separate so timestamp goes before it
     if parts:
-        last = parts[-1]
-        p = Path(last)
-        stem = p.stem
-        suffix = p.suffix
+        stem, suffix = os.path.splitext(parts[-1])
         parts[-1] = "%s - %s%s" % (stem, timestamp, suffix)
     filename = " - ".join(parts)
     return sanitize_for_filename(filename)
 
 
+def _iter_files(folder: str, dirs_seen: list = None):
+    """
+    Yield file paths under folder using os.scandir. failed_imports folders
+    are usually flat, so this is one scandir call with the file type taken
+    from the DirEntry; subdirectories are only descended when present.
+    Each directory is listed fully before yielding because callers move
+    the files out while iterating.
+
+    If dirs_seen is given, every directory visited is appended to it
+    (parents before children).
+    """
+    try:
+        with os.scandir(folder) as it:
+            entries = list(it)
+    except FileNotFoundError:
+        return
+
+    if dirs_seen is not None:
+        dirs_seen.append(folder)
+
+    for entry in entries:
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _iter_files(entry.path, dirs_seen)
+            elif entry.is_file():
+                yield entry.path
+        except FileNotFoundError:
+            continue
+
+
 def quarantine_folder(src_folder: Path):
     """
     Move all files from a failed_imports folder into the quarantine root.
@@ -82,31 +123,38 @@ def quarantine_folder(src_folder: Path):
     QUARANTINE_ROOT.mkdir(parents=True, exist_ok=True)
     timestamp = _ts_short()
 
-    for root, dirs, files in os.walk(src_folder):
-        for f in files:
-            src = Path(root) / f
-
-            if not src.exists():
-                continue
-
-            rel = src.relative_to(src_folder.parent)
-            flat_name = flatten_quarantine_filename(rel, timestamp)
-            dst = QUARANTINE_ROOT / flat_name
-
-            dst.parent.mkdir(parents=True, exist_ok=True)
-
-            qlog("QUARANTINE: %s -> %s" % (src, dst))
-
-            try:
-                # FIX: Use move instead of copy+delete
-                shutil.move(str(src), str(dst))
-            except Exception as e:
-                qlog("WARNING: could not move %s: %s" % (src, e))
-
-    try:
-        shutil.rmtree(src_folder, ignore_errors=True)
-    except Exception as e:
-        qlog("WARNING: could not remove folder %s: %s" % (src_folder, e))
+    # Everything below works on the str paths _iter_files yields; the
+    # flattened names never contain a separator, so every dst lands
+    # directly in the QUARANTINE_ROOT created above.
+    parent_prefix = os.path.join(str(src_folder.parent), "")
+    quarantine_root = str(QUARANTINE_ROOT)
+
+    dirs_seen = []
+    for src in _iter_files(str(src_folder), dirs_seen):
+        rel = src[len(parent_prefix):]
+        flat_name = flatten_quarantine_filename(rel, timestamp)
+        dst = os.path.join(quarantine_root, flat_name)
+
+        qlog("QUARANTINE: %s -> %s" % (src, dst))
+
+        try:
+            # FIX: Use move instead of copy+delete
+            move_path(src, dst)
+        except FileNotFoundError:
+            continue
+        except Exception as e:
+            qlog("WARNING: could not move %s: %s" % (src, e))
+
+    # Every file has been moved out, so the directories visited above are
+    # empty: remove them deepest-first rather than re-walking with rmtree.
+    # Anything that failed to move keeps its folder in place.
+    for d in reversed(dirs_seen):
+        try:
+            os.rmdir(d)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            qlog("WARNING: could not remove folder %s: %s" % (d, e))
 
 
 def quarantine_failed_imports_global(root_path: Path):
@@ -118,14 +166,15 @@ def quarantine_failed_imports_global(root_path: Path):
         return
 
     # SAFETY: Never scan /inbox
-    root_path_str = str(root_path.resolve())
+    root_path_str = _resolved_str(root_path)
     if root_path_str.startswith("/inbox"):
         qlog("SKIP: /inbox should never contain failed_imports folders")
         return
 
     qlog("Scanning for failed_imports under: %s" % root_path)
 
-    active_slsk_paths = slskd_active_transfers()
+    # Indexed once; artist_in_use is checked for every failed_imports found
+    active_slsk_paths = build_active_index(slskd_active_transfers())
 
     for current_root, dirs, files in os.walk(root_path):
         for d in list(dirs):
@@ -15,16 +15,38 @@ complete in seconds.
 """
 
 import os
-import json
+import time
+import orjson
 from pathlib import Path
-from datetime import datetime
 from urllib.parse import quote
-from mutagen import File as MutagenFile
+from mutagen import File as MutagenFile, MutagenError
+from mutagen.flac import FLAC
+from mutagen.mp3 import MP3
+from mutagen.mp4 import MP4
+from mutagen.oggvorbis import OggVorbis
+from mutagen.wave import WAVE
 
 DATA_DIR = Path("/data")
 LIBRARY_ROOT = Path("/music/library")
 FAILED_IMPORTS_NAME = "failed_imports"
 
+# Tuple form so filenames can be tested with str.endswith() directly,
+# without building a Path or parsing the suffix for every file.
+AUDIO_SUFFIXES = (".flac", ".mp3", ".m4a", ".ogg", ".wav", ".aac")
+
+# Open known formats with their parser directly instead of letting
+# mutagen.File() score every registered format against the header.
+# These are the classes mutagen.File() itself picks for these suffixes
+# (not the Easy* wrappers), so the tags and the title/track fallbacks
+# come out exactly as before and match entries already in albums.json.
+_FORMAT_BY_SUFFIX = {
+    ".flac": FLAC,
+    ".mp3": MP3,
+    ".m4a": MP4,
+    ".ogg": OggVorbis,
+    ".wav": WAVE,
+}
+
 
 def human_time(seconds: float) -> str:
     seconds = int(seconds)
@@ -36,13 +58,28 @@ def human_time(seconds: float) -> str:
     return "%02d:%02d" % (m, s)
 
 
+def _open_audio(path: Path):
+    """
+    Open path with the mutagen class for its extension. Falls back to
+    format sniffing for unknown suffixes or files whose content does not
+    match their extension.
+    """
+    fmt = _FORMAT_BY_SUFFIX.get(path.suffix.lower())
+    if fmt is not None:
+        try:
+            return fmt(path)
+        except MutagenError:
+            pass
+    return MutagenFile(path)
+
+
 def extract_track_metadata(path: Path):
     """
     Extract audio metadata via Mutagen.
     Returns None on any failure so a single bad file can't crash the run.
     """
     try:
-        audio = MutagenFile(path)
+        audio = _open_audio(path)
         if audio is None:
             return None
 
@@ -91,44 +128,71 @@ def extract_track_metadata(path: Path):
         return None
 
 
-def find_cover(album_dir: Path):
-    for name in ("cover.jpg", "cover.png", "Cover.jpg", "Cover.png", "folder.jpg", "folder.png"):
-        p = album_dir / name
-        if p.exists():
-            return p
+COVER_NAMES = ("cover.jpg", "cover.png", "Cover.jpg", "Cover.png", "folder.jpg", "folder.png")
+
+
+def find_cover(album_dir: Path, names_in_dir=None):
+    """
+    Return the first cover file found in album_dir, or None.
+    names_in_dir is the set of filenames already listed by the caller;
+    when given, no extra stat() calls are made.
+    """
+    if names_in_dir is None:
+        try:
+            names_in_dir = set(os.listdir(album_dir))
+        except OSError:
+            return None
+    for name in COVER_NAMES:
+        if name in names_in_dir:
+            return album_dir / name
     return None
 
 
 def is_failed_imports_folder(path: Path) -> bool:
-    return FAILED_IMPORTS_NAME in [p.name for p in path.parents] or path.name == FAILED_IMPORTS_NAME
+    # String membership test -- avoids building a Path for every ancestor.
+    s = str(path)
+    return (
+        path.name == FAILED_IMPORTS_NAME
+        or (os.sep + FAILED_IMPORTS_NAME + os.sep) in s
+    )
 
 
-def scan_album_dir(artist_dir: Path, album_dir: Path):
+def scan_album_dir(artist_dir: Path, album_dir: Path, mtime: float = None):
     """
     Scan a single album directory and return an album object, or None if
     no valid audio files are found.
+
+    mtime may be passed in when the caller already has it from a scandir
+    entry, saving a second stat() of the album folder.
     """
     albumartist = artist_dir.name
     album = album_dir.name
 
-    try:
-        mtime = album_dir.stat().st_mtime
-    except Exception:
-        mtime = 0
-    added_iso = datetime.fromtimestamp(mtime).isoformat() if mtime else ""
+    if mtime is None:
+        try:
+            mtime = album_dir.stat().st_mtime
+        except Exception:
+            mtime = 0
+    added_iso = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(mtime)) if mtime else ""
 
     track_entries = []
     album_duration = 0.0
     album_size = 0
     album_tracks = 0
 
+    top_level_names = None
+
     for root, dirs, files in os.walk(album_dir):
+        if top_level_names is None:
+            # First walk step is album_dir itself; keep its listing for
+            # the cover lookup below.
+            top_level_names = set(files)
         if FAILED_IMPORTS_NAME in root.split(os.sep):
             continue
         for f in sorted(files):
-            p = Path(root) / f
-            if p.suffix.lower() not in {".flac", ".mp3", ".m4a", ".ogg", ".wav", ".aac"}:
+            if not f.lower().endswith(AUDIO_SUFFIXES):
                 continue
+            p = Path(root) / f
             meta = extract_track_metadata(p)
             if meta:
                 track_entries.append(meta)
@@ -141,7 +205,7 @@ def scan_album_dir(artist_dir: Path, album_dir: Path):
 
     track_entries.sort(key=lambda t: (t["track"] is None, t["track"]))
 
-    cover_file = find_cover(album_dir)
+    cover_file = find_cover(album_dir, top_level_names)
     if cover_file:
         encoded_artist = quote(albumartist, safe="")
         encoded_album = quote(album, safe="")
@@ -164,6 +228,18 @@ def scan_album_dir(artist_dir: Path, album_dir: Path):
     }
 
 
+def _subdirs(path: Path):
+    """
+    Return the subdirectory DirEntries of path, in directory order.
+    Uses os.scandir so the is_dir() check comes from the directory read.
+    """
+    try:
+        with os.scandir(path) as it:
+            return [e for e in it if e.is_dir()]
+    except (FileNotFoundError, NotADirectoryError):
+        return []
+
+
 def load_existing_cache() -> dict:
     """
     Load existing albums.json and return a dict keyed by album filesystem path.
@@ -173,7 +249,9 @@ def load_existing_cache() -> dict:
     if not albums_path.exists():
         return {}
     try:
-        data = json.loads(albums_path.read_text(encoding="utf-8"))
+        # albums.json stays a plain list: /api/albums/all serves it as-is.
+        # The parse dominates load time, so use orjson for that.
+        data = orjson.loads(albums_path.read_bytes())
         cache = {a["_path"]: a for a in data if "_path" in a}
         if not cache and data:
             # Old format without _path — force full rescan this one time
@@ -202,23 +280,23 @@ def generate_ui_json():
     scanned = 0
     reused = 0
 
-    for artist_dir in sorted(LIBRARY_ROOT.iterdir()):
-        if not artist_dir.is_dir():
-            continue
+    for artist_entry in _subdirs(LIBRARY_ROOT):
+        artist_dir = Path(artist_entry.path)
         if is_failed_imports_folder(artist_dir):
             continue
 
-        for album_dir in sorted(artist_dir.iterdir()):
-            if not album_dir.is_dir():
-                continue
+        for album_entry in _subdirs(artist_dir):
+            album_dir = Path(album_entry.path)
             if is_failed_imports_folder(album_dir):
                 continue
 
-            album_path = str(album_dir)
+            album_path = album_entry.path
             seen_paths.add(album_path)
 
+            # DirEntry caches the stat result, so the mtime read here is
+            # reused by scan_album_dir below instead of a second stat().
             try:
-                current_mtime = album_dir.stat().st_mtime
+                current_mtime = album_entry.stat().st_mtime
             except Exception:
                 current_mtime = 0
 
@@ -231,13 +309,17 @@ def generate_ui_json():
                 continue
 
             # New or changed folder — rescan
-            album_obj = scan_album_dir(artist_dir, album_dir)
+            album_obj = scan_album_dir(artist_dir, album_dir, current_mtime)
             if album_obj:
                 albums.append(album_obj)
                 scanned += 1
             else:
                 print("[regenerate] Skipping (no audio): %s" % album_dir)
 
+    # Directories are walked unsorted; sort once here so albums.json keeps
+    # a stable artist/album order for the UI.
+    albums.sort(key=lambda a: (a["albumartist"], a["album"]))
+
     dropped = len([k for k in cache if k not in seen_paths])
 
     print("[regenerate] Scanned: %d new/changed | Reused: %d cached | Dropped: %d deleted"
@@ -245,18 +327,28 @@ def generate_ui_json():
 
     recent = sorted(albums, key=lambda a: a["mtime"], reverse=True)
 
-    total_tracks = sum(a.get("total_tracks", 0) for a in albums)
-    total_duration = sum(a.get("total_duration", 0.0) for a in albums)
-    total_size = sum(a.get("total_size", 0) for a in albums)
-    total_artists = {a["albumartist"] for a in albums if a.get("albumartist")}
+    # Single pass over albums for all totals
+    total_tracks = 0
+    total_duration = 0.0
+    total_size = 0
+    total_artists = set()
+    for a in albums:
+        total_tracks += a.get("total_tracks", 0)
+        total_duration += a.get("total_duration", 0.0)
+        total_size += a.get("total_size", 0)
+        aa = a.get("albumartist")
+        if aa:
+            total_artists.add(aa)
 
     DATA_DIR.mkdir(parents=True, exist_ok=True)
 
-    with open(DATA_DIR / "albums.json", "w", encoding="utf-8") as f:
-        json.dump(albums, f, indent=2)
+    # orjson serializes straight to UTF-8 bytes, much faster than json.dump
+    # on the multi-megabyte album lists.
+    (DATA_DIR / "albums.json").write_bytes(
+        orjson.dumps(albums, option=orjson.OPT_INDENT_2))
 
-    with open(DATA_DIR / "recent_albums.json", "w", encoding="utf-8") as f:
-        json.dump(recent, f, indent=2)
+    (DATA_DIR / "recent_albums.json").write_bytes(
+        orjson.dumps(recent, option=orjson.OPT_INDENT_2))
 
     stats = {
         "artists": len(total_artists),
@@ -267,8 +359,8 @@ def generate_ui_json():
         "total_size": total_size,
     }
 
-    with open(DATA_DIR / "stats.json", "w", encoding="utf-8") as f:
-        json.dump(stats, f, indent=2)
+    (DATA_DIR / "stats.json").write_bytes(
+        orjson.dumps(stats, option=orjson.OPT_INDENT_2))
 
     print("[regenerate] Complete: %d albums, %d tracks, %d artists."
           % (len(albums), total_tracks, len(total_artists)))
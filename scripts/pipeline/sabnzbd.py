@@ -5,14 +5,24 @@ SABnzbd Integration Module - v7.4
 """
 
 import os
+import threading
+import time
+import orjson
 import requests
 from pathlib import Path
 
 from .logging import log, vlog
+from .util import HTTP_SESSION
 
 SABNZBD_URL     = os.getenv("SABNZBD_URL",     "http://10.0.0.100:8080/api")
 SABNZBD_API_KEY = os.getenv("SABNZBD_API_KEY", "")
 
+_QUEUE_PARAMS = {
+    "mode": "queue",
+    "output": "json",
+    "apikey": SABNZBD_API_KEY,
+}
+
 ACTIVE_STATUSES = {
     "Downloading",
     "Verifying",
@@ -23,45 +33,110 @@ ACTIVE_STATUSES = {
 }
 
 
-def sabnzbd_is_processing(artist_folder: Path) -> bool:
-    try:
-        params = {
-            "mode": "queue",
-            "output": "json",
-            "apikey": SABNZBD_API_KEY,
-        }
+# Parsed queue slots are reused for this many seconds. The pipeline checks
+# artists back to back and the queue changes on a scale of seconds, so this
+# turns one HTTP GET per artist into one per window.
+QUEUE_CACHE_TTL = 3.0
+
+_queue_cache = {"ts": 0.0, "slots": None}
+_queue_lock = threading.Lock()
+
+
+def _get_queue_slots(ttl: float = QUEUE_CACHE_TTL):
+    """
+    Return the SABnzbd queue slots, cached for ttl seconds.
+    Errors propagate to the caller and are never cached.
+
+    Artists are prepared on worker threads: the lock covers the check and
+    the refresh, so an expired entry is fetched once while the others wait
+    for it rather than each fetching and writing the cache half-updated.
+    """
+    with _queue_lock:
+        now = time.monotonic()
+        if _queue_cache["slots"] is not None and now - _queue_cache["ts"] < ttl:
+            return _queue_cache["slots"]
+
+        r = HTTP_SESSION.get(SABNZBD_URL, params=_QUEUE_PARAMS, timeout=5)
+        data = orjson.loads(r.content)
+        slots = data.get("queue", {}).get("slots", [])
+
+        _queue_cache["ts"] = now
+        _queue_cache["slots"] = slots
+        return slots
 
-        r = requests.get(SABNZBD_URL, params=params, timeout=5)
-        data = r.json()
 
-        artist_name_lower = artist_folder.name.lower()
+def _build_active_jobs(slots):
+    """
+    Reduce queue slots to what the per-artist check needs:
+    ({storage path component: status}, [(filename, status), ...]),
+    lowercased, active jobs only.
+    """
+    components = {}
+    filenames = []
+    for job in slots:
+        status = job.get("status", "")
+        if status not in ACTIVE_STATUSES:
+            continue
 
-        for job in data.get("queue", {}).get("slots", []):
-            status = job.get("status", "")
+        storage = job.get("storage", "")
+        for part in storage.lower().split(os.sep):
+            if part:
+                components.setdefault(part, status)
 
-            if status not in ACTIVE_STATUSES:
-                continue
+        filename = job.get("filename", "").lower()
+        if filename:
+            filenames.append((filename, status))
+    return components, filenames
 
-            storage = job.get("storage", "")
-            if storage:
-                storage_path = Path(storage)
-                path_parts_lower = [p.lower() for p in storage_path.parts]
-                if artist_name_lower in path_parts_lower:
-                    vlog("[SABNZBD] Active job ({}) matches artist: {}".format(
-                        status, artist_folder.name))
-                    return True
 
-            filename = job.get("filename", "").lower()
-            if artist_name_lower in filename:
-                vlog("[SABNZBD] Active job ({}) filename matches artist: {}".format(
-                    status, artist_folder.name))
-                return True
+_active_jobs_cache = {"slots": None, "jobs": None}
+_active_jobs_lock = threading.Lock()
 
-        return False
 
+def sabnzbd_active_jobs():
+    """
+    Fetch the queue once and return the active-job snapshot that
+    sabnzbd_is_processing() accepts, so a batch of artists can be checked
+    against one fetch. Returns None if SABnzbd can't be queried.
+    """
+    try:
+        slots = _get_queue_slots()
     except requests.exceptions.ConnectionError:
         vlog("[SABNZBD] Cannot connect - assuming not processing")
-        return False
+        return None
     except Exception as e:
         log("[SABNZBD] Error checking status: {}".format(e))
-        return False
+        return None
+
+    # Same cached slots list -> same snapshot. Separate lock from the queue
+    # cache's, which _get_queue_slots() has already released.
+    with _active_jobs_lock:
+        if _active_jobs_cache["slots"] is not slots:
+            _active_jobs_cache["jobs"] = _build_active_jobs(slots)
+            _active_jobs_cache["slots"] = slots
+        return _active_jobs_cache["jobs"]
+
+
+def sabnzbd_is_processing(artist_folder: Path, active_jobs=None) -> bool:
+    if active_jobs is None:
+        active_jobs = sabnzbd_active_jobs()
+        if active_jobs is None:
+            return False
+
+    components, filenames = active_jobs
+    artist_name_lower = artist_folder.name.lower()
+
+    # Whole storage path component match is a dict lookup
+    status = components.get(artist_name_lower)
+    if status is not None:
+        vlog("[SABNZBD] Active job ({}) matches artist: {}".format(
+            status, artist_folder.name))
+        return True
+
+    for filename, status in filenames:
+        if artist_name_lower in filename:
+            vlog("[SABNZBD] Active job ({}) filename matches artist: {}".format(
+                status, artist_folder.name))
+            return True
+
+    return False
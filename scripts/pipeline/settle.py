@@ -1,30 +1,183 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import ctypes
+import errno
 import os
+import sys
 import time
 from pathlib import Path
 
 from .logging import vlog
 
 
-def folder_is_settled(path: Path, min_age_seconds: int) -> bool:
+# ---------------------------------------------------------------------------
+# statx(AT_STATX_DONT_SYNC) mtime reads
+# ---------------------------------------------------------------------------
+# The inbox can be a network mount. A plain stat() may force the client to
+# revalidate attributes with the server for every file; statx() with
+# AT_STATX_DONT_SYNC takes whatever the client already has cached, and
+# STATX_MTIME asks only for the field we use. Python 3.11 has no os.statx,
+# so call glibc's wrapper through ctypes and fall back to DirEntry.stat()
+# when it isn't there (non-Linux, old glibc, or blocked by seccomp).
+
+_AT_FDCWD = -100
+_AT_STATX_DONT_SYNC = 0x4000
+_STATX_MTIME = 0x40
+
+
+class _StatxTimestamp(ctypes.Structure):
+    _fields_ = [
+        ("tv_sec", ctypes.c_int64),
+        ("tv_nsec", ctypes.c_uint32),
+        ("_reserved", ctypes.c_int32),
+    ]
+
+
+class _Statx(ctypes.Structure):
+    _fields_ = [
+        ("stx_mask", ctypes.c_uint32),
+        ("stx_blksize", ctypes.c_uint32),
+        ("stx_attributes", ctypes.c_uint64),
+        ("stx_nlink", ctypes.c_uint32),
+        ("stx_uid", ctypes.c_uint32),
+        ("stx_gid", ctypes.c_uint32),
+        ("stx_mode", ctypes.c_uint16),
+        ("_spare0", ctypes.c_uint16),
+        ("stx_ino", ctypes.c_uint64),
+        ("stx_size", ctypes.c_uint64),
+        ("stx_blocks", ctypes.c_uint64),
+        ("stx_attributes_mask", ctypes.c_uint64),
+        ("stx_atime", _StatxTimestamp),
+        ("stx_btime", _StatxTimestamp),
+        ("stx_ctime", _StatxTimestamp),
+        ("stx_mtime", _StatxTimestamp),
+        ("_spare", ctypes.c_uint8 * 128),   # rdev/dev + spare; 256 bytes total
+    ]
+
+
+def _load_statx():
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        fn = ctypes.CDLL(None, use_errno=True).statx
+    except (OSError, AttributeError):
+        return None
+    fn.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_int,
+                   ctypes.c_uint, ctypes.POINTER(_Statx)]
+    fn.restype = ctypes.c_int
+    return fn
+
+
+_statx = _load_statx()
+
+
+def _entry_mtime(entry) -> float:
+    """mtime of a DirEntry, via statx when available."""
+    global _statx
+
+    if _statx is not None:
+        buf = _Statx()
+        rc = _statx(_AT_FDCWD, os.fsencode(entry.path), _AT_STATX_DONT_SYNC,
+                    _STATX_MTIME, ctypes.byref(buf))
+        if rc == 0:
+            return buf.stx_mtime.tv_sec + buf.stx_mtime.tv_nsec / 1e9
+        err = ctypes.get_errno()
+        if err in (errno.ENOSYS, errno.EPERM):
+            # Kernel too old or syscall filtered: stop trying
+            _statx = None
+        else:
+            raise OSError(err, os.strerror(err), entry.path)
+
+    return entry.stat().st_mtime
+
+
+def _iter_file_mtimes(path):
+    """
+    Yield the mtime of every file under path using os.scandir, reading
+    each file's stat straight from its DirEntry instead of building a Path
+    per file. Mirrors os.walk: directory symlinks are not followed and
+    subdirectories that vanish or can't be read are skipped. Errors on
+    path itself propagate to the caller.
+    """
+    with os.scandir(path) as it:
+        entries = list(it)
+
+    for entry in entries:
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                try:
+                    yield from _iter_file_mtimes(entry.path)
+                except OSError:
+                    pass
+            elif not entry.is_dir():
+                yield _entry_mtime(entry)
+        except FileNotFoundError:
+            pass
+
+
+# ---------------------------------------------------------------------------
+# Per-run settle cache
+# ---------------------------------------------------------------------------
+
+# A folder that passed the settle check makes every folder beneath it
+# settled too, so the album subfolder checks right after an artist check
+# don't need to re-walk the same files. Only positive results are cached
+# (a folder that wasn't settled may be by the next check), and entries
+# expire after SETTLE_CACHE_TTL so a long run still re-walks artists it
+# reaches much later.
+SETTLE_CACHE_TTL = 60.0
+_settle_cache = {}
+
+
+def clear_settle_cache():
+    _settle_cache.clear()
+
+
+def _cached_settled(path: Path, min_age_seconds: int) -> bool:
+    now = time.monotonic()
+    for p in (path, *path.parents):
+        checked = _settle_cache.get((str(p), min_age_seconds))
+        if checked is not None and now - checked < SETTLE_CACHE_TTL:
+            return True
+    return False
+
+
+def folder_is_settled(path: Path, min_age_seconds: int, use_cache: bool = True) -> bool:
+    """
+    use_cache=False always walks the folder (the result is still cached),
+    for checks that must see the files as they are now.
+    """
+    path = Path(path)
+    if use_cache and _cached_settled(path, min_age_seconds):
+        vlog("SETTLE CHECK: %s settled (cached)" % path)
+        return True
+
+    settled = _folder_is_settled(path, min_age_seconds)
+    if settled:
+        _settle_cache[(str(path), min_age_seconds)] = time.monotonic()
+    return settled
+
+
+def _folder_is_settled(path: Path, min_age_seconds: int) -> bool:
     """
     Check if a folder has been idle for at least min_age_seconds.
     FIX: Handles FileNotFoundError during walk (race condition protection).
     FIX: Returns True if folder disappears mid-check (treat as settled/gone).
     """
     newest_mtime = 0
+    now = time.time()
+    cutoff = now - min_age_seconds
 
     try:
-        for root, dirs, files in os.walk(path):
-            for f in files:
-                try:
-                    mtime = (Path(root) / f).stat().st_mtime
-                    if mtime > newest_mtime:
-                        newest_mtime = mtime
-                except FileNotFoundError:
-                    pass
+        for mtime in _iter_file_mtimes(path):
+            # One file inside the grace window is enough: stop walking
+            if mtime > cutoff:
+                vlog("SETTLE CHECK: %s age=%.1fs threshold=%ss (early exit)" % (
+                    path, now - mtime, min_age_seconds))
+                return False
+            if mtime > newest_mtime:
+                newest_mtime = mtime
     except FileNotFoundError:
         # Folder disappeared mid-walk - treat as settled (it's gone)
         vlog("SETTLE CHECK: %s disappeared during walk - treating as settled" % path)
@@ -36,7 +189,7 @@ def folder_is_settled(path: Path, min_age_seconds: int) -> bool:
     if newest_mtime == 0:
         return True
 
-    age = time.time() - newest_mtime
+    age = now - newest_mtime
     vlog("SETTLE CHECK: %s age=%.1fs threshold=%ss" % (path, age, min_age_seconds))
 
     return age >= min_age_seconds
@@ -5,21 +5,53 @@ SLSKD Integration Module - v7.4
 """
 
 import os
+import re
 import time
+import orjson
 import requests
 from pathlib import Path
+from urllib3.util.retry import Retry
 from .logging import log, vlog
-from .util import INBOX
+from .util import INBOX, HTTP_SESSION
 from .fuzzy import tokenize, fuzzy_match
 
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
 
 SLSKD_API_KEY = os.getenv("SLSKD_API_KEY", "")
 SLSKD_HOST    = os.getenv("SLSKD_HOST",    "http://10.0.0.100:5030")
 
-SLSKD_RETRY_DELAYS = [2, 4, 8]
+_TRANSFERS_URL = "{}/api/v0/transfers/downloads".format(SLSKD_HOST)
+_HEADERS = {"X-API-Key": SLSKD_API_KEY}
+
+# Retry policy lives on the HTTP adapter: 3 attempts in total with
+# exponential backoff between them, reusing the pooled connection.
+SLSKD_RETRY = Retry(
+    total=2,
+    backoff_factor=2,
+    status_forcelist=(500, 502, 503, 504),
+    allowed_methods=("GET",),
+    raise_on_status=False,
+)
+
+# Mounted on the SLSKD host prefix only, so SABnzbd/Navidrome calls on the
+# shared session keep failing fast.
+HTTP_SESSION.mount(SLSKD_HOST, requests.adapters.HTTPAdapter(
+    pool_connections=1, pool_maxsize=4, max_retries=SLSKD_RETRY))
+
 SLSKD_GLOBAL_THRESHOLD = 0
 SLSKD_GLOBAL_WAIT = 30
 
+# Active files from the last complete read of the transfers tree, and its
+# ETag. Polls send If-None-Match so an unchanged downloads tree comes back
+# as an empty 304 instead of the full JSON being re-sent and re-parsed.
+_last_etag = None
+_last_active = None
+
 ACTIVE_STATES = {
     "requested",
     "initializing",
@@ -31,75 +63,124 @@ TERMINAL_STATES = {
     "completed",
 }
 
+# Compiled once: a single regex search per file replaces the any(... in state)
+# scans over each set. States are compound strings like "Queued, Remotely".
+_ACTIVE_RE = re.compile("|".join(sorted(ACTIVE_STATES)))
+_TERMINAL_RE = re.compile("|".join(sorted(TERMINAL_STATES)))
 
-def slskd_get_transfers():
-    url = "{}/api/v0/transfers/downloads".format(SLSKD_HOST)
-    headers = {"X-API-Key": SLSKD_API_KEY}
-
-    for attempt, delay in enumerate(SLSKD_RETRY_DELAYS, 1):
-        try:
-            r = requests.get(url, headers=headers, timeout=10)
-            r.raise_for_status()
-            return r.json()
-
-        except requests.exceptions.HTTPError as e:
-            if e.response.status_code == 404:
-                vlog("[SLSKD] Endpoint not found - check SLSKD API version")
-                return []
-            elif e.response.status_code == 401:
-                vlog("[SLSKD] Authentication failed - check API key")
-                return []
-            vlog("[SLSKD] HTTP error (attempt {}/{}): {}".format(
-                attempt, len(SLSKD_RETRY_DELAYS), e))
-            if attempt < len(SLSKD_RETRY_DELAYS):
-                time.sleep(delay)
-
-        except requests.exceptions.JSONDecodeError as e:
-            vlog("[SLSKD] JSON decode error: {}".format(e))
-            if attempt < len(SLSKD_RETRY_DELAYS):
-                time.sleep(delay)
-
-        except requests.exceptions.ConnectionError as e:
-            vlog("[SLSKD] Connection error: {}".format(e))
-            if attempt < len(SLSKD_RETRY_DELAYS):
-                time.sleep(delay)
-
-        except Exception as e:
-            vlog("[SLSKD] Retry after error: {}".format(e))
-            if attempt < len(SLSKD_RETRY_DELAYS):
-                time.sleep(delay)
-
-    log("[SLSKD] All retries failed, treating SLSKD as busy.")
-    return None
 
+def _tree_files(transfers):
+    """Yield (username, file) for every file in a parsed downloads tree."""
+    for user in transfers:
+        username = user.get("username", "unknown")
+        for directory in user.get("directories", []):
+            for file in directory.get("files", []):
+                yield username, file
+
+
+def _stream_files(raw):
+    """
+    Yield (username, file) from the downloads tree with ijson, so the full
+    users/directories/files tree is never built in memory.
+    """
+    raw.decode_content = True
+    for file in ijson.items(raw, "item.directories.item.files.item"):
+        yield file.get("username", "unknown"), file
+
+
+def _fetch_active_files(stream: bool):
+    """
+    One conditional GET of the downloads tree. Returns [(username, file)]
+    for the active/queued files with a filename; errors propagate. Only a
+    body that parsed completely updates the ETag cache.
+    """
+    global _last_etag, _last_active
+
+    headers = _HEADERS
+    if _last_etag and _last_active is not None:
+        headers = dict(_HEADERS, **{"If-None-Match": _last_etag})
+
+    with HTTP_SESSION.get(_TRANSFERS_URL, headers=headers, timeout=10, stream=stream) as r:
+        if r.status_code == 304:
+            return _last_active
+        r.raise_for_status()
+
+        files = _stream_files(r.raw) if stream else _tree_files(orjson.loads(r.content))
+        active = []
+        for username, file in files:
+            state = file.get("state", "").lower()
+            if _TERMINAL_RE.search(state):
+                continue
+            if _ACTIVE_RE.search(state) and file.get("filename"):
+                active.append((username, file))
+
+    _last_etag = r.headers.get("ETag")
+    _last_active = active
+    return active
 
-def slskd_active_transfers():
-    transfers = slskd_get_transfers()
-    if not transfers:
-        return []
 
-    active = []
+def slskd_active_files():
+    """
+    Return [(username, file)] for every active/queued SLSKD download, or
+    None if the transfer list could not be read.
+
+    With ijson the body is stream-parsed. A stream that breaks part-way is
+    read again in full with orjson: a partial list would make artists that
+    are still downloading look idle.
+    """
+    try:
+        if IJSON_AVAILABLE:
+            try:
+                return _fetch_active_files(stream=True)
+            except (requests.exceptions.HTTPError, requests.exceptions.ConnectionError):
+                raise
+            except Exception as e:
+                vlog("[SLSKD] Transfer stream failed, re-reading in full: {}".format(e))
+        return _fetch_active_files(stream=False)
+
+    except requests.exceptions.HTTPError as e:
+        if e.response.status_code == 404:
+            vlog("[SLSKD] Endpoint not found - check SLSKD API version")
+            return []
+        elif e.response.status_code == 401:
+            vlog("[SLSKD] Authentication failed - check API key")
+            return []
+        vlog("[SLSKD] HTTP error: {}".format(e))
+
+    except orjson.JSONDecodeError as e:
+        vlog("[SLSKD] JSON decode error: {}".format(e))
+
+    except requests.exceptions.ConnectionError as e:
+        vlog("[SLSKD] Connection error: {}".format(e))
+
+    except Exception as e:
+        vlog("[SLSKD] Error fetching transfers: {}".format(e))
 
-    for user in transfers:
-        username = user.get("username", "unknown")
-        directories = user.get("directories", [])
+    log("[SLSKD] All retries failed, treating SLSKD as busy.")
+    return None
 
-        for directory in directories:
-            files = directory.get("files", [])
 
-            for file in files:
-                raw_state = file.get("state", "")
-                state = raw_state.lower()
-                filename = file.get("filename", "")
+def slskd_active_transfers(stop_after: int = None):
+    """
+    Return filenames of active/queued SLSKD downloads. An empty list if
+    SLSKD could not be read, as before.
 
-                if any(t in state for t in TERMINAL_STATES):
-                    continue
+    If stop_after is given, stop as soon as more than stop_after active
+    files have been seen. The result is then only a lower bound on the
+    count.
+    """
+    files = slskd_active_files()
+    if not files:
+        return []
 
-                if any(s in state for s in ACTIVE_STATES):
-                    if filename:
-                        active.append(filename)
-                        vlog("[SLSKD] Active: {} - {} ({})".format(
-                            username, filename, raw_state))
+    active = []
+    for username, file in files:
+        filename = file["filename"]
+        active.append(filename)
+        vlog("[SLSKD] Active: {} - {} ({})".format(
+            username, filename, file.get("state", "")))
+        if stop_after is not None and len(active) > stop_after:
+            break
 
     if active:
         log("[SLSKD] Found {} active/queued transfers".format(len(active)))
@@ -112,18 +193,18 @@ def global_settle():
     start_time = time.time()
 
     while True:
-        active = slskd_active_transfers()
+        # Only need to know whether the threshold is exceeded
+        active = slskd_active_transfers(stop_after=SLSKD_GLOBAL_THRESHOLD)
         count = len(active)
 
-        elapsed = time.time() - start_time
-        if elapsed > max_wait_time:
-            log("[SLSKD] Timeout after {:.0f}s - proceeding anyway ({} active)".format(
-                elapsed, count))
-            return active
-
         if count > SLSKD_GLOBAL_THRESHOLD:
-            log("[SLSKD] {} active/queued transfers. Waiting {}s...".format(
-                count, SLSKD_GLOBAL_WAIT))
+            elapsed = time.time() - start_time
+            if elapsed > max_wait_time:
+                log("[SLSKD] Timeout after {:.0f}s - proceeding anyway".format(elapsed))
+                return slskd_active_transfers()
+
+            log("[SLSKD] More than {} active/queued transfers. Waiting {}s...".format(
+                SLSKD_GLOBAL_THRESHOLD, SLSKD_GLOBAL_WAIT))
             time.sleep(SLSKD_GLOBAL_WAIT)
             continue
 
@@ -135,17 +216,66 @@ def global_settle():
         return active
 
 
+def build_active_index(active_paths):
+    """
+    Build an inverted index {token: first active path containing it}.
+
+    fuzzy_match is a pure token-overlap test, so an artist is in use iff one
+    of its tokens is a key here. Build this once per batch of active paths
+    and pass it to artist_in_use in place of the list to turn each check
+    into a few dict lookups instead of a scan over every transfer.
+    """
+    index = {}
+    for path in active_paths:
+        for t in tokenize(path):
+            index.setdefault(t, path)
+    return index
+
+
 def artist_in_use(artist_folder: Path, active_paths):
+    """
+    Return True if artist_folder matches any active SLSKD transfer.
+    active_paths may be the raw list from slskd_active_transfers() or an
+    index from build_active_index().
+    """
     if not active_paths:
         return False
 
-    folder_tokens = tokenize(artist_folder.name)
+    # Set form so the per-path prefilter is a C-level isdisjoint() and
+    # fuzzy_match's membership tests are O(1).
+    folder_tokens = frozenset(tokenize(artist_folder.name))
+    if not folder_tokens:
+        return False
+
+    if isinstance(active_paths, dict):
+        for t in folder_tokens:
+            path = active_paths.get(t)
+            if path is not None:
+                vlog("[SLSKD] Artist '{}' matches active transfer: {}".format(
+                    artist_folder.name, path))
+                return True
+        return False
 
     for path in active_paths:
         path_tokens = tokenize(path)
+        if folder_tokens.isdisjoint(path_tokens):
+            continue
         if fuzzy_match(path_tokens, folder_tokens):
             vlog("[SLSKD] Artist '{}' matches active transfer: {}".format(
                 artist_folder.name, path))
             return True
 
     return False
+
+
+def filter_in_use(artist_folders, active_paths):
+    """
+    Batch form of artist_in_use: return the set of artist_folders that
+    match any active transfer. The active paths are indexed once for the
+    whole batch rather than rescanned per folder.
+    """
+    if not active_paths:
+        return set()
+
+    index = active_paths if isinstance(active_paths, dict) else build_active_index(active_paths)
+    return {af for af in artist_folders if artist_in_use(af, index)}
@@ -2,10 +2,13 @@
 # -*- coding: utf-8 -*-
 
 import os
+import stat
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
 
-from .util import LIBRARY
+from .util import LIBRARY, HTTP_SESSION
 from .logging import log
 
 SUBSONIC_HOST     = os.getenv("SUBSONIC_HOST",     "http://10.0.0.100")
@@ -13,40 +16,81 @@ SUBSONIC_PORT     = os.getenv("SUBSONIC_PORT",     "4533")
 SUBSONIC_USER     = os.getenv("SUBSONIC_USER",     "")
 SUBSONIC_PASSWORD = os.getenv("SUBSONIC_PASSWORD", "")
 
+_SUBSONIC_SCAN_URL = "%s:%s/rest/startScan" % (SUBSONIC_HOST, SUBSONIC_PORT)
+_SUBSONIC_PARAMS = {
+    "u": SUBSONIC_USER,
+    "p": SUBSONIC_PASSWORD,
+    "v": "1.13.0",
+    "c": "beets",
+    "f": "json",
+}
+
 VOLUMIO_MPD_HOST  = os.getenv("VOLUMIO_MPD_HOST",  "10.0.0.102")
 
+VOLUMIO_SSH_OPTS = [
+    "-o", "ConnectTimeout=10",
+    "-o", "StrictHostKeyChecking=no",
+    "-o", "BatchMode=yes",
+    "-o", "ControlPath=/tmp/ssh-volumio-%r@%h:%p",
+]
+VOLUMIO_SSH_PERSIST = "10m"
+
+
+LIBRARY_DIR_MODE = 0o755
+LIBRARY_FILE_MODE = 0o644
+
+
+def _fix_tree_permissions(path) -> int:
+    """
+    Walk path with os.scandir and chmod anything whose mode is off.
+    Modes come from the DirEntry stat, so already-correct entries (nearly
+    all of them on a settled library) cost no syscall beyond the lstat.
+    Symlinks are left alone, same as find -type d / -type f.
+    Returns the number of entries changed.
+    """
+    changed = 0
+    with os.scandir(path) as it:
+        entries = list(it)
+
+    for entry in entries:
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                wanted = LIBRARY_DIR_MODE
+            elif entry.is_file(follow_symlinks=False):
+                wanted = LIBRARY_FILE_MODE
+            else:
+                continue
+            if stat.S_IMODE(entry.stat(follow_symlinks=False).st_mode) != wanted:
+                os.chmod(entry.path, wanted)
+                changed += 1
+            if wanted == LIBRARY_DIR_MODE:
+                changed += _fix_tree_permissions(entry.path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            # Keep going like find does; one bad entry shouldn't stop the pass
+            log("[PERMISSIONS] WARNING: %s" % e)
+    return changed
+
 
 def fix_library_permissions():
     try:
         log("[PERMISSIONS] Fixing library permissions...")
-        subprocess.run(
-            ["find", str(LIBRARY), "-type", "d", "-exec", "chmod", "755", "{}", "+"],
-            check=False, timeout=60
-        )
-        subprocess.run(
-            ["find", str(LIBRARY), "-type", "f", "-exec", "chmod", "644", "{}", "+"],
-            check=False, timeout=60
-        )
-        log("[PERMISSIONS] Library permissions corrected.")
-    except subprocess.TimeoutExpired:
-        log("[PERMISSIONS] WARNING: chmod timed out on large library")
+        # One in-process pass instead of find + chmod over every path
+        changed = 0
+        if stat.S_IMODE(os.stat(LIBRARY).st_mode) != LIBRARY_DIR_MODE:
+            os.chmod(LIBRARY, LIBRARY_DIR_MODE)
+            changed += 1
+        changed += _fix_tree_permissions(LIBRARY)
+        log("[PERMISSIONS] Library permissions corrected (%d changed)." % changed)
     except Exception as e:
         log("[PERMISSIONS] ERROR: %s" % e)
 
 
 def trigger_subsonic_scan_from_config():
-    url = "%s:%s/rest/startScan" % (SUBSONIC_HOST, SUBSONIC_PORT)
-    params = {
-        "u": SUBSONIC_USER,
-        "p": SUBSONIC_PASSWORD,
-        "v": "1.13.0",
-        "c": "beets",
-        "f": "json",
-    }
-
     try:
-        log("[SUBSONIC] Triggering Navidrome scan at %s" % url)
-        r = requests.get(url, params=params, timeout=10)
+        log("[SUBSONIC] Triggering Navidrome scan at %s" % _SUBSONIC_SCAN_URL)
+        r = HTTP_SESSION.get(_SUBSONIC_SCAN_URL, params=_SUBSONIC_PARAMS, timeout=10)
         log("[SUBSONIC] Response %s: %s" % (r.status_code, r.text[:200]))
     except requests.exceptions.ConnectionError:
         log("[SUBSONIC] Cannot connect to Navidrome - skipping scan")
@@ -54,14 +98,48 @@ def trigger_subsonic_scan_from_config():
         log("[SUBSONIC] Scan trigger failed: %s" % e)
 
 
+def _ensure_volumio_ssh_master():
+    """
+    Make sure a persistent SSH master connection to Volumio is running so
+    rescans multiplex over it instead of doing a full SSH handshake each
+    time. The master is started on its own with stdio on /dev/null:
+    starting it from the captured rescan command would leave the
+    backgrounded master holding the output pipes, and subprocess.run
+    would block until it exits.
+    """
+    target = "volumio@%s" % VOLUMIO_MPD_HOST
+    check = subprocess.run(
+        ["ssh", *VOLUMIO_SSH_OPTS, "-O", "check", target],
+        check=False, timeout=10,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    if check.returncode == 0:
+        return
+
+    subprocess.run(
+        ["ssh", *VOLUMIO_SSH_OPTS,
+         "-o", "ControlMaster=yes",
+         "-o", "ControlPersist=%s" % VOLUMIO_SSH_PERSIST,
+         "-N", "-f", target],
+        check=False, timeout=20,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+
+
 def trigger_volumio_rescan():
     try:
         log("[VOLUMIO] Triggering Volumio rescan...")
+        try:
+            _ensure_volumio_ssh_master()
+        except Exception as e:
+            # Not fatal: the rescan below connects directly without a master
+            log("[VOLUMIO] Could not start SSH master connection: %s" % e)
+
         result = subprocess.run(
             ["ssh",
-             "-o", "ConnectTimeout=10",
-             "-o", "StrictHostKeyChecking=no",
-             "-o", "BatchMode=yes",
+             *VOLUMIO_SSH_OPTS,
+             "-o", "ControlMaster=no",
              "volumio@%s" % VOLUMIO_MPD_HOST,
              "volumio", "rescan"],
             check=False,
@@ -77,3 +155,18 @@ def trigger_volumio_rescan():
         log("[VOLUMIO] SSH timeout - Volumio may be unreachable")
     except Exception as e:
         log("[VOLUMIO] ERROR triggering rescan: %s" % e)
+
+
+def trigger_all_rescans():
+    """
+    Trigger the Navidrome scan and the Volumio rescan concurrently.
+    They are independent (HTTP vs SSH) and each can block for its full
+    timeout, so running them side by side bounds the wait by the slower one.
+    """
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        futures = [
+            ex.submit(trigger_subsonic_scan_from_config),
+            ex.submit(trigger_volumio_rescan),
+        ]
+        for f in futures:
+            f.result()
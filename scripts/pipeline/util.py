@@ -6,6 +6,8 @@ import subprocess
 import time
 import os
 
+import requests
+
 # Core paths
 INBOX = Path("/inbox")
 PRELIB = Path("/pre-library")
@@ -18,9 +20,24 @@ PIPELINE_STATUS_JSON = DATA_DIR / "pipeline_status.json"
 
 MAX_LOG_SIZE = 10 * 1024 * 1024
 
+# Shared keep-alive HTTP session for SLSKD, SABnzbd and Navidrome calls.
+# Reusing pooled connections avoids a TCP handshake on every poll.
+HTTP_SESSION = requests.Session()
+_http_adapter = requests.adapters.HTTPAdapter(
+    pool_connections=4, pool_maxsize=8, max_retries=0)
+HTTP_SESSION.mount("http://", _http_adapter)
+HTTP_SESSION.mount("https://", _http_adapter)
+
+
+_data_dir_ready = False
+
 
 def ensure_data_dir():
-    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    # DATA_DIR only has to be created once per process
+    global _data_dir_ready
+    if not _data_dir_ready:
+        DATA_DIR.mkdir(parents=True, exist_ok=True)
+        _data_dir_ready = True
 
 
 def rotate_if_needed(path: Path):
@@ -52,5 +69,10 @@ def run(cmd):
     return result
 
 
+# Single-pass C translation for the characters that can't (or shouldn't)
+# appear in a folder name component.
+_FOLDER_NAME_TABLE = str.maketrans({"/": "-", "\\": "-", "\x00": "-"})
+
+
 def safe_folder_name(text) -> str:
-    return (text or "Unknown").replace("/", "-").strip()
+    return (text or "Unknown").translate(_FOLDER_NAME_TABLE).strip()
@@ -30,38 +30,66 @@ Changes from v7.6:
 import errno
 import fcntl
 import os
-import subprocess
+import signal
 import sys
+import threading
 import traceback
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import count, islice
 from pathlib import Path
 import time
 import shutil
 
 from scripts.pipeline.logging import log, update_status
-from scripts.pipeline.slskd import artist_in_use, slskd_active_transfers
-from scripts.pipeline.sabnzbd import sabnzbd_is_processing
-from scripts.pipeline.settle import folder_is_settled
-from scripts.pipeline.cleanup import cleanup_inbox_junk, cleanup_empty_inbox_tree
+from scripts.pipeline.slskd import (
+    artist_in_use,
+    slskd_active_transfers,
+    build_active_index,
+    filter_in_use,
+)
+from scripts.pipeline.sabnzbd import sabnzbd_is_processing, sabnzbd_active_jobs
+from scripts.pipeline.settle import folder_is_settled, clear_settle_cache
+from scripts.pipeline.cleanup import (
+    is_audio_name,
+    cleanup_inbox_junk,
+    cleanup_empty_inbox_tree,
+)
 from scripts.pipeline.moves import (
     move_group_to_prelibrary,
     move_existing_album_folder_to_prelibrary,
+    move_path,
     PreLibraryFullError,
 )
 from scripts.pipeline.metadata import group_files_by_album
 from scripts.pipeline.beets import run_fingerprint, run_beets_import, run_post_import
 from scripts.pipeline.system_hooks import (
     fix_library_permissions,
-    trigger_subsonic_scan_from_config,
-    trigger_volumio_rescan,
+    trigger_all_rescans,
 )
 from scripts.pipeline.util import INBOX, PRELIB
 from scripts.pipeline.quarantine import quarantine_failed_imports_global
 from scripts.pipeline.regenerate import generate_ui_json
 
 
-CHUNK_SIZE = 500
 LOCK_FILE = Path("/data/pipeline.lock")
 
+# Artists prepared (checked, cleaned, scanned, tagged) ahead of the one
+# currently importing. Imports themselves always run one at a time.
+ARTIST_PREP_WORKERS = 4
+
+# Album file size checks are spread over a few threads once an album has
+# at least SIZE_CHECK_MIN_BATCH audio files.
+SIZE_CHECK_WORKERS = 8
+SIZE_CHECK_MIN_BATCH = 4
+
+# The SLSKD transfer index used for the per-artist recheck is reused for
+# this many seconds, so artists prepared back to back share one fetch.
+ACTIVE_INDEX_TTL = 5.0
+
+# Top-level pre-library entries removed in parallel by clear_prelibrary()
+PRELIB_CLEAR_WORKERS = 4
+
 # Drain pre-library when tmpfs usage reaches this percentage.
 # 85% gives enough headroom to move the next album before hitting 100%.
 PRELIB_DRAIN_THRESHOLD = 85
@@ -101,6 +129,19 @@ def log_prelibrary_usage():
 # Pre-library management
 # ---------------------------------------------------------------------------
 
+def _clear_prelib_entry(item) -> bool:
+    try:
+        # d_type from the directory read, no stat per entry
+        if item.is_dir(follow_symlinks=False):
+            shutil.rmtree(item.path)
+        else:
+            os.unlink(item.path)
+        return True
+    except Exception as e:
+        log("[PRELIB] Could not clear %s: %s" % (item.name, e))
+        return False
+
+
 def clear_prelibrary():
     """
     Wipe /pre-library contents, skipping the failed_imports subfolder.
@@ -109,22 +150,24 @@ def clear_prelibrary():
     if not PRELIB.exists():
         return
 
-    cleared = 0
-    errors = 0
+    with os.scandir(PRELIB) as it:
+        entries = []
+        for item in it:
+            if item.name == "failed_imports":
+                log("[PRELIB] Skipping failed_imports (handled by quarantine)")
+                continue
+            entries.append(item)
 
-    for item in PRELIB.iterdir():
-        if item.name == "failed_imports":
-            log("[PRELIB] Skipping failed_imports (handled by quarantine)")
-            continue
-        try:
-            if item.is_dir():
-                shutil.rmtree(item)
-            else:
-                item.unlink()
-            cleared += 1
-        except Exception as e:
-            log("[PRELIB] Could not clear %s: %s" % (item.name, e))
-            errors += 1
+    # Top-level entries are independent trees; removing them side by side
+    # overlaps the unlink syscalls (released GIL) across artists
+    if len(entries) > 1:
+        with ThreadPoolExecutor(max_workers=PRELIB_CLEAR_WORKERS) as ex:
+            results = list(ex.map(_clear_prelib_entry, entries))
+    else:
+        results = [_clear_prelib_entry(item) for item in entries]
+
+    cleared = sum(results)
+    errors = len(results) - cleared
 
     if errors:
         log("[PRELIB] WARNING: %d items could not be cleared" % errors)
@@ -175,6 +218,21 @@ def maybe_drain_prelibrary(context: str = ""):
 # Lock
 # ---------------------------------------------------------------------------
 
+def lock_holder_pid(lockfile: Path):
+    """
+    PID recorded in the lock file by its last holder, or None if the file
+    is missing, empty or unreadable.
+    """
+    try:
+        return int(lockfile.read_bytes().split()[0])
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def pid_alive(pid) -> bool:
+    return pid is not None and os.path.exists("/proc/%d" % pid)
+
+
 class PipelineLock:
     """File-based lock to prevent concurrent pipeline runs."""
 
@@ -183,54 +241,88 @@ class PipelineLock:
         self.timeout = timeout
         self.lock_fd = None
 
-    def __enter__(self):
-        log("[LOCK] Attempting to acquire lock: %s" % self.lockfile)
-        self.lockfile.touch(exist_ok=True)
-        self.lock_fd = open(self.lockfile, "a")
+    def _open(self) -> int:
+        # One open() both creates the file if needed and gives us the fd,
+        # instead of touch() followed by a second open()
+        return os.open(str(self.lockfile),
+                       os.O_RDWR | os.O_CREAT | os.O_CLOEXEC, 0o644)
+
+    def _acquire(self) -> bool:
+        """
+        Block in flock() until the lock is free or self.timeout expires.
+        The kernel wakes us as soon as the holder releases, instead of
+        polling once a second. The timeout comes from a SIGALRM timer,
+        so this must run on the main thread (it always does here).
+        """
+        fd = self.lock_fd
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except BlockingIOError:
+            log("[LOCK] Waiting for lock...")
 
-        start_time = time.time()
-        while True:
+        def _on_alarm(signum, frame):
+            raise BlockingIOError(errno.EWOULDBLOCK, "lock wait timed out")
+
+        previous = signal.signal(signal.SIGALRM, _on_alarm)
+        signal.setitimer(signal.ITIMER_REAL, self.timeout)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            return True
+        except BlockingIOError:
+            # The timer may have fired just after flock() returned; a
+            # non-blocking retry settles whether we actually hold it.
             try:
-                fcntl.flock(self.lock_fd.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
-                log("[LOCK] Lock acquired successfully")
-                return self
-            except IOError:
-                if time.time() - start_time >= self.timeout:
-                    try:
-                        check = subprocess.run(
-                            ["pgrep", "-f", "pipeline_controller_v7.py"],
-                            capture_output=True, text=True
-                        )
-                        pids = [p for p in check.stdout.strip().splitlines()
-                                if p.strip() != str(os.getpid())]
-                        if not pids:
-                            log("[LOCK] Stale lock detected (no live process). Clearing.")
-                            self.lock_fd.close()
-                            self.lockfile.unlink(missing_ok=True)
-                            self.lockfile.touch(exist_ok=True)
-                            self.lock_fd = open(self.lockfile, "a")
-                            start_time = time.time()
-                            continue
-                    except Exception as e:
-                        log("[LOCK] Could not check for live process: %s" % e)
-
-                    self.lock_fd.close()
-                    log("[LOCK] ERROR: Could not acquire lock (another instance running?)")
-                    raise RuntimeError(
-                        "Pipeline is already running. "
-                        "If this is incorrect, remove %s" % self.lockfile
-                    )
-                log("[LOCK] Waiting for lock...")
-                time.sleep(1)
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return True
+            except BlockingIOError:
+                return False
+        finally:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+
+    def __enter__(self):
+        log("[LOCK] Attempting to acquire lock: %s" % self.lockfile)
+        self.lock_fd = self._open()
+
+        if self._acquire():
+            # Record who holds it so others can say so; the flock itself is
+            # what keeps them out. The holder may not be a controller
+            # process (the watcher runs main() in-process), so nothing
+            # matches on command lines.
+            os.ftruncate(self.lock_fd, 0)
+            os.pwrite(self.lock_fd, b"%d\n" % os.getpid(), 0)
+            log("[LOCK] Lock acquired successfully")
+            return self
+
+        # The kernel drops a flock when its holder exits, so a lock we
+        # can't take is never stale: never unlink it, or the next run
+        # would lock a fresh inode alongside the live holder.
+        holder = lock_holder_pid(self.lockfile)
+        os.close(self.lock_fd)
+        self.lock_fd = None
+        if pid_alive(holder):
+            log("[LOCK] ERROR: Lock held by running pid %d" % holder)
+        else:
+            log("[LOCK] ERROR: Lock held by another process (recorded pid: %s)" % holder)
+        raise RuntimeError(
+            "Pipeline is already running (lock %s held, pid %s)" % (self.lockfile, holder)
+        )
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        if self.lock_fd:
-            fcntl.flock(self.lock_fd.fileno(), fcntl.LOCK_UN)
-            self.lock_fd.close()
+        if self.lock_fd is not None:
+            fcntl.flock(self.lock_fd, fcntl.LOCK_UN)
+            os.close(self.lock_fd)
+            self.lock_fd = None
             log("[LOCK] Lock released")
         return False
 
 
+# Built once and reused by every main() call; __exit__ closes the fd so
+# the same instance can be entered again
+_PIPELINE_LOCK = PipelineLock(timeout=5)
+
+
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
@@ -241,87 +333,212 @@ def cleanup_invalid_failed_imports():
         if not path.exists():
             continue
         log("[CLEANUP] Removing invalid failed_imports from: %s" % path)
-        for root, dirs, files in os.walk(str(path)):
-            for d in dirs:
-                try:
-                    os.chmod(os.path.join(root, d), 0o755)
-                except Exception:
-                    pass
-            for f in files:
-                try:
-                    os.chmod(os.path.join(root, f), 0o644)
-                except Exception as e:
-                    log("[CLEANUP] Cannot chmod %s: %s -- attempting removal anyway" % (f, e))
-        try:
-            shutil.rmtree(path)
+        root = str(path)
+        retried = set()
+
+        def _force_remove(func, p, exc_info):
+            # rmtree onerror hook: open up permissions on just the entry
+            # that failed (and its parent, below root) and retry it once
+            if isinstance(exc_info[1], FileNotFoundError):
+                return
+            if (func, p) in retried:
+                log("[CLEANUP] Cannot remove %s: %s" % (p, exc_info[1]))
+                return
+            retried.add((func, p))
+            try:
+                if p != root:
+                    os.chmod(os.path.dirname(p), 0o755)
+                if func in (os.unlink, os.rmdir):
+                    func(p)
+                else:
+                    # A directory that couldn't be opened, listed or stat'ed
+                    os.chmod(p, 0o755)
+                    shutil.rmtree(p, onerror=_force_remove)
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                log("[CLEANUP] Cannot remove %s: %s" % (p, e))
+
+        # One rmtree pass; permissions are only touched where a removal
+        # actually fails, instead of chmodding the whole tree up front
+        shutil.rmtree(root, onerror=_force_remove)
+        if not path.exists():
             log("[CLEANUP] Successfully removed: %s" % path)
-        except Exception as e:
-            log("[CLEANUP] Could not remove %s: %s" % (path, e))
+        else:
+            log("[CLEANUP] Could not remove %s" % path)
             log("[CLEANUP] Fix manually: docker exec beetsV7 rm -rf /inbox/failed_imports")
 
 
 def list_artist_folders():
-    if not INBOX.exists():
+    # DirEntry.is_dir() answers from the getdents d_type, no stat per entry.
+    # All entries share INBOX as parent, so sorting by name gives the same
+    # order as sorting Paths, with plain str comparisons.
+    try:
+        with os.scandir(INBOX) as it:
+            names = sorted(
+                e.name for e in it
+                if e.is_dir()
+                and not e.name.startswith("_UNPACK_")
+                and e.name != "failed_imports"
+            )
+    except FileNotFoundError:
         return []
-    return [
-        p for p in sorted(INBOX.iterdir())
-        if p.is_dir()
-        and not p.name.startswith("_UNPACK_")
-        and p.name != "failed_imports"
-    ]
+    return [INBOX / name for name in names]
+
 
+# Smallest plausible audio file; anything below this is a stub or an
+# aborted transfer.
+MIN_AUDIO_BYTES = 100
 
-def quick_corruption_check(filepath: Path) -> bool:
+
+def quick_size_check(filepath: Path, size: int = None) -> bool:
+    """
+    Size check on an audio file: present, non-empty and at least
+    MIN_AUDIO_BYTES long. The file is never opened or decoded: files that
+    are big enough but undecodable are left to beets, whose rejects go
+    through quarantine_failed_imports_global().
+    size may be passed in by callers that already have it from a DirEntry.
+    """
     try:
-        if not filepath.exists() or filepath.stat().st_size == 0:
-            log("[CORRUPT] Empty or missing: %s" % filepath.name)
-            return False
-        with open(filepath, "rb") as f:
-            header = f.read(1024)
-            if len(header) < 100:
-                log("[CORRUPT] File too small: %s" % filepath.name)
-                return False
-        return True
+        if size is None:
+            size = os.stat(filepath).st_size
+    except FileNotFoundError:
+        size = 0
     except Exception as e:
-        log("[CORRUPT] Cannot read %s: %s" % (filepath.name, e))
+        log("[CORRUPT] Cannot stat %s: %s" % (filepath.name, e))
+        return False
+
+    if size == 0:
+        log("[CORRUPT] Empty or missing: %s" % filepath.name)
+        return False
+    if size < MIN_AUDIO_BYTES:
+        log("[CORRUPT] File too small: %s" % filepath.name)
         return False
+    return True
+
+
+def _size_check_entry(entry):
+    audio_file = Path(entry.path)
+    try:
+        size = entry.stat().st_size
+    except FileNotFoundError:
+        return audio_file, None
+    return audio_file, quick_size_check(audio_file, size)
+
+
+def batch_size_check(entries: list) -> list:
+    """
+    Run quick_size_check() over an album's audio DirEntry list and
+    return [(path, ok)] in order, dropping files that vanished.
+
+    Each check is one stat, so an album's worth is dominated by per-file
+    latency (noticeable on network mounts); from SIZE_CHECK_MIN_BATCH
+    files up the stats are overlapped on a small thread pool. Smaller
+    albums stay serial, where the pool would cost more than it saves.
+    """
+    if len(entries) >= SIZE_CHECK_MIN_BATCH:
+        with ThreadPoolExecutor(max_workers=SIZE_CHECK_WORKERS) as pool:
+            results = list(pool.map(_size_check_entry, entries))
+    else:
+        results = [_size_check_entry(e) for e in entries]
+    return [(path, ok) for path, ok in results if ok is not None]
+
+
+def _scan_audio(root: str, found: list = None) -> list:
+    """
+    Collect the DirEntry of every audio file under root in one recursive
+    os.scandir pass (same coverage as rglob: directory symlinks are not
+    followed, file symlinks are). Errors on root propagate; unreadable
+    subfolders are skipped.
+    """
+    if found is None:
+        found = []
+    with os.scandir(root) as it:
+        for entry in it:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    try:
+                        _scan_audio(entry.path, found)
+                    except OSError:
+                        pass
+                elif entry.is_file() and is_audio_name(entry.name):
+                    found.append(entry)
+            except OSError:
+                continue
+    return found
+
+
+_quarantine_lock = threading.Lock()
+
+# One timestamp per controller run plus a running counter: every corrupt
+# file from this run sorts together and gets a unique name without a
+# strftime/localtime per file. main() refreshes the timestamp, since the
+# watcher calls it repeatedly in one process.
+_QUARANTINE_RUN_TS = time.strftime("%Y%m%d_%H%M%S")
+_quarantine_counter = count()
 
 
 def quarantine_corrupted_file(filepath: Path):
     from scripts.pipeline.quarantine import QUARANTINE_ROOT
     QUARANTINE_ROOT.mkdir(parents=True, exist_ok=True)
-    timestamp = time.strftime("%Y%m%d_%H%M%S")
-    dst = QUARANTINE_ROOT / ("corrupt_%s_%s" % (timestamp, filepath.name))
     log("[QUARANTINE] Corrupted file: %s" % filepath.name)
-    try:
-        shutil.move(str(filepath), str(dst))
-    except Exception as e:
-        log("[QUARANTINE] Failed to move %s: %s" % (filepath, e))
-
-
-def chunk_list(items: list, chunk_size: int):
-    for i in range(0, len(items), chunk_size):
-        yield items[i:i + chunk_size]
+    # Artists are prepared concurrently; the counter is drawn and the file
+    # moved under one lock. The exists() loop only matters if a previous
+    # run started in the same second.
+    with _quarantine_lock:
+        while True:
+            dst = QUARANTINE_ROOT / ("corrupt_%s_%04d_%s" % (
+                _QUARANTINE_RUN_TS, next(_quarantine_counter), filepath.name))
+            if not dst.exists():
+                break
+        try:
+            # Plain rename when inbox and quarantine share a filesystem,
+            # shutil.move's copy only on EXDEV
+            move_path(filepath, dst)
+        except Exception as e:
+            log("[QUARANTINE] Failed to move %s: %s" % (filepath, e))
 
 
 # ---------------------------------------------------------------------------
 # Core artist processing
 # ---------------------------------------------------------------------------
 
-def process_artist(artist_folder: Path, active_paths):
+def _is_ready(artist_folder: Path, active_paths, sab_jobs) -> bool:
+    """Same safety checks as prepare_artist(), without logging."""
+    if not artist_folder.exists():
+        return False
+    if artist_in_use(artist_folder, active_paths):
+        return False
+    if sabnzbd_is_processing(artist_folder, sab_jobs):
+        return False
+    return folder_is_settled(artist_folder, 300)
+
+
+def batch_ready_artists(folders: list, active_paths) -> list:
     """
-    Process one artist folder through the full pipeline.
+    Run the per-artist safety checks for all folders concurrently and
+    return the ready ones in their original order.
 
-    Flow:
-    1. Safety checks (SLSKD, SABnzbd, settle timer)
-    2. Junk cleanup
-    3. Collect loose files and album subfolders up front
-    4. Move album subfolders to pre-library in chunks, import each chunk
-       - Before each album move: check tmpfs usage, drain proactively at 85%
-       - On ENOSPC (PreLibraryFullError): emergency drain then retry once
-    5. Move loose file groups to pre-library in chunks, import each chunk
-       - Same proactive and reactive ENOSPC handling
-    6. Clean up empty inbox tree
+    The checks are almost entirely filesystem/HTTP wait, so threads overlap
+    them fine. active_paths and one SABnzbd queue snapshot are shared.
+    """
+    # No snapshot means SABnzbd is unreachable: treat as not processing
+    sab_jobs = sabnzbd_active_jobs() or ({}, [])
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(
+            lambda f: _is_ready(f, active_paths, sab_jobs), folders))
+    return [f for f, ready in zip(folders, results) if ready]
+
+
+def prepare_artist(artist_folder: Path, active_paths):
+    """
+    Steps 1-3 of process_artist(): safety checks, junk cleanup, collecting
+    and validating album subfolders and loose files (tags included).
+
+    Only touches the artist's own inbox folder and the quarantine, never
+    pre-library, so several artists can be prepared at once while another
+    one is importing. Returns (albums_to_process, loose_groups), or None if
+    the artist is skipped.
     """
     if not artist_folder.exists():
         log("[SKIP] Folder disappeared before processing: %s" % artist_folder)
@@ -340,7 +557,6 @@ def process_artist(artist_folder: Path, active_paths):
         return
 
     log("ARTIST: %s" % artist_folder)
-    update_status("running", "processing artist", artist_folder.name)
 
     try:
         cleanup_inbox_junk(artist_folder)
@@ -348,24 +564,28 @@ def process_artist(artist_folder: Path, active_paths):
         log("[SKIP] Folder disappeared during cleanup: %s" % artist_folder)
         return
 
-    if not artist_folder.exists():
-        log("[SKIP] Folder removed during cleanup: %s" % artist_folder)
-        return
-
+    # One scandir pass sorts entries into loose files and album subfolders
+    # using the cached d_type instead of a stat per is_file()/is_dir().
+    # It also covers cleanup having removed the folder: no exists() first.
+    loose_audio = []
+    subdirs = []
     try:
-        all_contents = list(artist_folder.iterdir())
+        with os.scandir(artist_folder) as it:
+            for entry in it:
+                try:
+                    if entry.is_file():
+                        if is_audio_name(entry.name):
+                            loose_audio.append(entry)
+                    elif entry.is_dir():
+                        subdirs.append(Path(entry.path))
+                except OSError:
+                    continue
     except FileNotFoundError:
-        log("[SKIP] Folder disappeared while listing contents: %s" % artist_folder)
+        log("[SKIP] Folder removed during cleanup or listing: %s" % artist_folder)
         return
 
-    loose_audio = [
-        p for p in all_contents
-        if p.is_file()
-        and p.suffix.lower() in {".flac", ".mp3", ".m4a", ".ogg", ".wav", ".aac"}
-    ]
-
     albums_to_process = []
-    for sub in sorted(p for p in all_contents if p.is_dir()):
+    for sub in sorted(subdirs):
         try:
             if sub.name == "failed_imports":
                 continue
@@ -376,151 +596,225 @@ def process_artist(artist_folder: Path, active_paths):
             log("[SKIP] Album subfolder not settled: %s" % sub)
             continue
 
+        # One scan per album: the valid files are whatever passes the
+        # corruption check, so there is no second walk after quarantining
         try:
-            audio_files = [
-                f for f in sub.rglob("*")
-                if f.is_file()
-                and f.suffix.lower() in {".flac", ".mp3", ".m4a", ".ogg", ".wav", ".aac"}
-            ]
+            audio_entries = _scan_audio(str(sub))
         except (FileNotFoundError, PermissionError):
             log("[SKIP] Cannot access subfolder: %s" % sub)
             continue
 
         corrupted_count = 0
-        for audio_file in audio_files:
-            if not quick_corruption_check(audio_file):
+        remaining = []
+        for audio_file, ok in batch_size_check(audio_entries):
+            if ok:
+                remaining.append(audio_file)
+            else:
                 quarantine_corrupted_file(audio_file)
                 corrupted_count += 1
 
-        try:
-            remaining = [
-                f for f in sub.rglob("*")
-                if f.is_file()
-                and f.suffix.lower() in {".flac", ".mp3", ".m4a", ".ogg", ".wav", ".aac"}
-            ]
-        except (FileNotFoundError, PermissionError):
-            log("[SKIP] Folder disappeared during corruption check: %s" % sub)
-            continue
-
         if remaining:
             if corrupted_count > 0:
-                log("[VALIDATE] Removed %d corrupted files from %s" % (corrupted_count, sub.name))
+                log("[VALIDATE] Removed %d empty or undersized files from %s" % (corrupted_count, sub.name))
             albums_to_process.append(sub)
         else:
             log("[SKIP] No valid files remaining in %s" % sub.name)
 
-    # --- Process album subfolders in chunks ---
-    if albums_to_process:
-        total_albums = len(albums_to_process)
-        log("[CHUNK] Processing %d albums in chunks of %d" % (total_albums, CHUNK_SIZE))
+    group_items = []
+    if loose_audio:
+        valid_audio = []
+        for audio_file, ok in batch_size_check(loose_audio):
+            if ok:
+                valid_audio.append(audio_file)
+            else:
+                quarantine_corrupted_file(audio_file)
 
-        chunks = list(chunk_list(albums_to_process, CHUNK_SIZE))
-        for chunk_idx, album_chunk in enumerate(chunks, 1):
-            log("[CHUNK] Album chunk %d/%d (%d albums)" % (chunk_idx, len(chunks), len(album_chunk)))
+        if valid_audio:
+            group_items = list(group_files_by_album(valid_audio).items())
 
-            for album in album_chunk:
-                # Proactive: drain before the move if tmpfs is getting full
-                maybe_drain_prelibrary(album.name)
+    return albums_to_process, group_items
 
-                try:
-                    move_existing_album_folder_to_prelibrary(album)
-                except FileNotFoundError:
-                    log("[SKIP] Album folder disappeared: %s" % album)
-                except PreLibraryFullError:
-                    # Reactive: ENOSPC despite proactive check (album was huge)
-                    log("[ENOSPC] Emergency drain triggered by: %s" % album.name)
-                    drain_prelibrary("emergency ENOSPC")
-                    try:
-                        move_existing_album_folder_to_prelibrary(album)
-                    except (PreLibraryFullError, Exception) as retry_err:
-                        log("[ENOSPC] Retry failed for %s: %s — skipping" % (album.name, retry_err))
 
-            log("[CHUNK] Fingerprinting chunk %d" % chunk_idx)
-            run_fingerprint()
+def _still_ready(artist_folder: Path) -> bool:
+    """
+    prepare_artist()'s safety checks again, against a freshly fetched SLSKD
+    list and without the settle cache. An artist can be prepared several
+    imports before its own; a download that started or resumed since then
+    must not be moved half-written.
+    """
+    if artist_in_use(artist_folder, build_active_index(slskd_active_transfers())):
+        log("[SKIP] SLSKD active match before move: %s" % artist_folder)
+        return False
 
-            log("[CHUNK] Importing chunk %d" % chunk_idx)
-            run_beets_import()
+    if sabnzbd_is_processing(artist_folder):
+        log("[SKIP] SABnzbd still processing before move: %s" % artist_folder)
+        return False
 
-            log("[CHUNK] Post-processing chunk %d" % chunk_idx)
-            run_post_import()
+    if not folder_is_settled(artist_folder, 300, use_cache=False):
+        log("[SKIP] Grace period not met before move: %s" % artist_folder)
+        return False
 
-            if chunk_idx < len(chunks):
-                log("[CHUNK] Waiting 2s before next chunk...")
-                time.sleep(2)
+    return True
 
-    # --- Process loose audio files in chunks ---
-    if loose_audio:
-        valid_audio = []
-        for audio_file in loose_audio:
-            if audio_file.exists():
-                if quick_corruption_check(audio_file):
-                    valid_audio.append(audio_file)
-                else:
-                    quarantine_corrupted_file(audio_file)
 
-        if valid_audio:
-            groups = group_files_by_album(valid_audio)
-            group_items = list(groups.items())
-            total_groups = len(group_items)
+def import_artist(artist_folder: Path, albums_to_process, group_items):
+    """
+    Steps 4-7 of process_artist(): move, fingerprint and import what
+    prepare_artist() collected. Uses the shared pre-library and beets, so
+    only one artist may be importing at a time.
+    """
+    if not _still_ready(artist_folder):
+        return
 
-            log("[CHUNK] Processing %d loose file groups in chunks of %d" % (total_groups, CHUNK_SIZE))
+    update_status("running", "processing artist", artist_folder.name)
 
-            chunks = list(chunk_list(group_items, CHUNK_SIZE))
-            for chunk_idx, group_chunk in enumerate(chunks, 1):
-                log("[CHUNK] Loose chunk %d/%d (%d groups)" % (chunk_idx, len(chunks), len(group_chunk)))
+    # --- Move album subfolders to pre-library ---
+    if albums_to_process:
+        log("[MOVE] Moving %d albums to pre-library" % len(albums_to_process))
 
-                for (aa, al), files in group_chunk:
-                    # Proactive: drain before move if tmpfs is getting full
-                    maybe_drain_prelibrary("%s/%s" % (aa, al))
+        for album in albums_to_process:
+            # Proactive: drain before the move if tmpfs is getting full
+            maybe_drain_prelibrary(album.name)
 
-                    try:
-                        move_group_to_prelibrary(
-                            aa or artist_folder.name,
-                            al or "Unknown Album",
-                            files,
-                        )
-                    except PreLibraryFullError:
-                        log("[ENOSPC] Emergency drain triggered by loose group: %s/%s" % (aa, al))
-                        drain_prelibrary("emergency ENOSPC")
-                        try:
-                            move_group_to_prelibrary(
-                                aa or artist_folder.name,
-                                al or "Unknown Album",
-                                files,
-                            )
-                        except (PreLibraryFullError, Exception) as retry_err:
-                            log("[ENOSPC] Retry failed for %s/%s: %s — skipping" % (aa, al, retry_err))
-
-                log("[CHUNK] Fingerprinting loose chunk %d" % chunk_idx)
-                run_fingerprint()
-
-                log("[CHUNK] Importing loose chunk %d" % chunk_idx)
-                run_beets_import()
-
-                log("[CHUNK] Post-processing loose chunk %d" % chunk_idx)
-                run_post_import()
-
-                if chunk_idx < len(chunks):
-                    log("[CHUNK] Waiting 2s before next chunk...")
-                    time.sleep(2)
+            try:
+                move_existing_album_folder_to_prelibrary(album)
+            except FileNotFoundError:
+                log("[SKIP] Album folder disappeared: %s" % album)
+            except PreLibraryFullError:
+                # Reactive: ENOSPC despite proactive check (album was huge)
+                log("[ENOSPC] Emergency drain triggered by: %s" % album.name)
+                drain_prelibrary("emergency ENOSPC")
+                try:
+                    move_existing_album_folder_to_prelibrary(album)
+                except (PreLibraryFullError, Exception) as retry_err:
+                    log("[ENOSPC] Retry failed for %s: %s — skipping" % (album.name, retry_err))
+
+    # --- Move loose file groups to pre-library ---
+    if group_items:
+        log("[MOVE] Moving %d loose file groups to pre-library" % len(group_items))
+
+        for (aa, al), files in group_items:
+            # Proactive: drain before move if tmpfs is getting full
+            maybe_drain_prelibrary("%s/%s" % (aa, al))
+
+            try:
+                move_group_to_prelibrary(
+                    aa or artist_folder.name,
+                    al or "Unknown Album",
+                    files,
+                )
+            except PreLibraryFullError:
+                log("[ENOSPC] Emergency drain triggered by loose group: %s/%s" % (aa, al))
+                drain_prelibrary("emergency ENOSPC")
+                try:
+                    move_group_to_prelibrary(
+                        aa or artist_folder.name,
+                        al or "Unknown Album",
+                        files,
+                    )
+                except (PreLibraryFullError, Exception) as retry_err:
+                    log("[ENOSPC] Retry failed for %s/%s: %s — skipping" % (aa, al, retry_err))
+
+    # --- One fingerprint/import/post-import pass for everything moved ---
+    # Pre-library capacity is bounded by the drains above, so there is no
+    # need to split the import into chunks.
+    if albums_to_process or group_items:
+        log("[IMPORT] Fingerprinting %s" % artist_folder.name)
+        run_fingerprint()
+
+        log("[IMPORT] Importing %s" % artist_folder.name)
+        run_beets_import()
+
+        log("[IMPORT] Post-processing %s" % artist_folder.name)
+        run_post_import()
 
     # Cleanup empty inbox tree
     try:
-        if artist_folder.exists() and not any(artist_folder.iterdir()):
+        with os.scandir(artist_folder) as it:
+            empty = next(it, None) is None
+        if empty:
             cleanup_empty_inbox_tree(artist_folder)
     except FileNotFoundError:
         pass
 
 
+_active_index_cache = {"ts": 0.0, "index": None}
+_active_index_lock = threading.Lock()
+
+
+def _recent_active_index():
+    """
+    SLSKD active-transfer index, refetched at most once per
+    ACTIVE_INDEX_TTL. The lock keeps concurrent preparers from all
+    fetching when the entry expires.
+    """
+    with _active_index_lock:
+        now = time.monotonic()
+        if (_active_index_cache["index"] is None
+                or now - _active_index_cache["ts"] >= ACTIVE_INDEX_TTL):
+            _active_index_cache["index"] = build_active_index(slskd_active_transfers())
+            _active_index_cache["ts"] = now
+        return _active_index_cache["index"]
+
+
+def _prepare_with_fresh_index(artist_folder: Path):
+    return prepare_artist(artist_folder, _recent_active_index())
+
+
+def prepare_ahead(artists):
+    """
+    Yield (artist, future of prepare_artist()) in order, keeping at most
+    ARTIST_PREP_WORKERS artists prepared ahead of the caller. The small
+    lookahead overlaps the next artists' I/O with the current import
+    without preparing far-off artists long before they are imported.
+    """
+    with ThreadPoolExecutor(max_workers=ARTIST_PREP_WORKERS) as pool:
+        pending = deque()
+        remaining = iter(artists)
+        for artist in islice(remaining, ARTIST_PREP_WORKERS):
+            pending.append((artist, pool.submit(_prepare_with_fresh_index, artist)))
+
+        while pending:
+            artist, future = pending.popleft()
+            nxt = next(remaining, None)
+            if nxt is not None:
+                pending.append((nxt, pool.submit(_prepare_with_fresh_index, nxt)))
+            yield artist, future
+
+
+def process_artist(artist_folder: Path, active_paths):
+    """
+    Process one artist folder through the full pipeline.
+
+    Flow:
+    1. Safety checks (SLSKD, SABnzbd, settle timer)
+    2. Junk cleanup
+    3. Collect loose files and album subfolders up front
+    4. Move album subfolders to pre-library
+       - Before each album move: check tmpfs usage, drain proactively at 85%
+       - On ENOSPC (PreLibraryFullError): emergency drain then retry once
+    5. Move loose file groups to pre-library
+       - Same proactive and reactive ENOSPC handling
+    6. Fingerprint, import and post-process everything moved, once
+    7. Clean up empty inbox tree
+    """
+    prepared = prepare_artist(artist_folder, active_paths)
+    if prepared is not None:
+        import_artist(artist_folder, *prepared)
+
+
 # ---------------------------------------------------------------------------
 # Entry point
 # ---------------------------------------------------------------------------
 
 def main():
+    global _QUARANTINE_RUN_TS
+    _QUARANTINE_RUN_TS = time.strftime("%Y%m%d_%H%M%S")
     try:
-        with PipelineLock(timeout=5):
+        with _PIPELINE_LOCK:
             log("=== v7.7 Hybrid Pipeline Controller ===")
             update_status("running", "starting pipeline")
+            clear_settle_cache()
 
             cleanup_invalid_failed_imports()
 
@@ -544,26 +838,46 @@ def main():
                 update_status("idle", "inbox empty")
                 return
 
+            # Artists matching a transfer that was already active at startup
+            # are skipped in one batch pass; the rest are re-checked by
+            # prepare_artist() and again by import_artist() just before
+            # their files are moved.
+            busy_artists = filter_in_use(artists, active_paths_initial)
             for artist in artists:
-                if not artist.exists():
-                    log("[SKIP] Artist folder disappeared: %s" % artist)
-                    continue
-
-                active_paths = slskd_active_transfers()
-
+                if artist in busy_artists:
+                    log("[SKIP] SLSKD active match: %s" % artist)
+
+            # Ready artists go first; the rest are deferred to the end of the
+            # run so they get as much time as possible to settle. Every artist
+            # is re-checked by import_artist() just before its move.
+            candidates = [a for a in artists if a not in busy_artists]
+            ready = batch_ready_artists(
+                candidates, build_active_index(active_paths_initial))
+            ready_set = set(ready)
+            log("[SETTLE] %d/%d artists ready at startup" % (len(ready), len(candidates)))
+            artists = ready + [a for a in candidates if a not in ready_set]
+
+            # Preparation of the next few artists overlaps the current
+            # artist's import; imports stay strictly sequential.
+            for artist, prepared in prepare_ahead(artists):
                 try:
-                    process_artist(artist, active_paths)
+                    plan = prepared.result()
+                    if plan is not None:
+                        import_artist(artist, *plan)
                 except FileNotFoundError as e:
                     log("[SKIP] Folder disappeared during processing: %s - %s" % (artist, e))
                 except Exception as e:
                     log("[ERROR] Error processing %s: %s" % (artist, e))
                     log("[ERROR] Traceback: %s" % traceback.format_exc())
 
-            time.sleep(2)
-            fix_library_permissions()
-            generate_ui_json()
-            trigger_subsonic_scan_from_config()
-            trigger_volumio_rescan()
+            # The UI JSON only reads the library, so it is built alongside
+            # the permission fix and rescans. The rescans still wait for the
+            # permissions so the media servers can read the new files.
+            with ThreadPoolExecutor(max_workers=1) as ex:
+                ui_json = ex.submit(generate_ui_json)
+                fix_library_permissions()
+                trigger_all_rescans()
+                ui_json.result()
 
             log("=== v7.7 Pipeline Finished ===")
             update_status("success", "pipeline finished")
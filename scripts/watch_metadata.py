@@ -4,33 +4,92 @@
 import os
 import time
 import subprocess
+from collections import deque
 from pathlib import Path
+from inotify_simple import INotify, flags
 
 LIBRARY = Path("/music/library")
 SETTLE_SECONDS = 60
-SLEEP_SECONDS = 30
+
+# fetchart writes these into album folders during a pass; arriving art on
+# its own is not a new import
+ART_EXTS = frozenset({".jpg", ".jpeg", ".png", ".gif", ".webp", ".bmp"})
+
+# No CLOSE_WRITE: the pass rewrites tags in place on every file, which
+# would flood (and overflow) the queue. Imports always show up as
+# CREATE or MOVED_TO.
+WATCH_FLAGS = (
+    flags.CREATE
+    | flags.MOVED_TO
+    | flags.MOVED_FROM
+    | flags.DELETE
+)
 
 def run(cmd):
     print(f"[WATCHER] RUN: {' '.join(cmd)}")
     subprocess.run(cmd, check=False)
 
-def folder_is_settled(path):
-    newest = 0
-    for root, dirs, files in os.walk(path):
-        for f in files:
-            fp = Path(root) / f
-            try:
-                m = fp.stat().st_mtime
-                if m > newest:
-                    newest = m
-            except FileNotFoundError:
-                pass
-
-    if newest == 0:
-        return True
-
-    age = time.time() - newest
-    return age >= SETTLE_SECONDS
+def add_watch(inotify, path, wd_map):
+    try:
+        wd_map[inotify.add_watch(str(path), WATCH_FLAGS)] = path
+    except Exception as e:
+        print(f"[WATCHER] Could not watch {path}: {e}")
+
+def add_watch_tree(inotify, root, wd_map):
+    """
+    Watch root and every directory below it. Used at startup and for new
+    directories, which an import's mv may bring in with album folders
+    already inside.
+    """
+    queue = deque([Path(root)])
+    while queue:
+        d = queue.popleft()
+        add_watch(inotify, d, wd_map)
+        try:
+            with os.scandir(d) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        queue.append(Path(entry.path))
+        except OSError:
+            continue
+
+def handle_events(inotify, events, wd_map):
+    """
+    Track watches for directories that appear or go away. Returns
+    (changed, arrived): changed if any event touches the library, arrived
+    if something new came in from outside it -- a directory or non-art
+    file created or moved in, not renamed within the library.
+    """
+    changed = False
+    arrived = False
+    renamed = {e.cookie for e in events if e.mask & flags.MOVED_FROM}
+    for event in events:
+        mask = event.mask
+        # The directory was deleted or moved away: its watch is gone
+        if mask & flags.IGNORED:
+            wd_map.pop(event.wd, None)
+            continue
+        if mask & flags.Q_OVERFLOW:
+            changed = arrived = True
+            continue
+
+        name = event.name or ""
+        if name.startswith("."):
+            continue
+        changed = True
+
+        if not mask & (flags.CREATE | flags.MOVED_TO):
+            continue
+        if mask & flags.MOVED_TO and event.cookie in renamed:
+            continue
+        if mask & flags.ISDIR:
+            parent = wd_map.get(event.wd)
+            if parent:
+                add_watch_tree(inotify, parent / name, wd_map)
+            arrived = True
+        elif os.path.splitext(name)[1].lower() not in ART_EXTS:
+            arrived = True
+    return changed, arrived
 
 def run_metadata_pass():
     print("[WATCHER] Running metadata refresh pass...")
@@ -49,25 +108,55 @@ def run_metadata_pass():
 def main():
     print("[WATCHER] Metadata watcher started.")
 
-    last_mtime = 0
+    # inotify watches on every library directory replace polling the
+    # top-level mtime and walking the whole tree to see if it settled:
+    # the library is settled once SETTLE_SECONDS pass without events.
+    inotify = INotify()
+    wd_map = {}
+    LIBRARY.mkdir(parents=True, exist_ok=True)
+    add_watch_tree(inotify, LIBRARY, wd_map)
+    print(f"[WATCHER] Watching {len(wd_map)} directories")
+
+    # One pass at startup, as the polling loop did on its first check
+    deadline = time.monotonic()
 
     while True:
         try:
-            current_mtime = LIBRARY.stat().st_mtime
-
-            if current_mtime != last_mtime:
-                print("[WATCHER] Change detected in library.")
-                last_mtime = current_mtime
-
-                if folder_is_settled(LIBRARY):
-                    run_metadata_pass()
-                else:
-                    print("[WATCHER] Library not settled yet, waiting...")
+            if deadline is None:
+                timeout_ms = None
+            else:
+                timeout_ms = max(0, int((deadline - time.monotonic()) * 1000))
+
+            events = inotify.read(timeout=timeout_ms)
+            if events:
+                changed, _ = handle_events(inotify, events, wd_map)
+                if changed:
+                    if deadline is None:
+                        print("[WATCHER] Change detected in library.")
+                    deadline = time.monotonic() + SETTLE_SECONDS
+                continue
+
+            if deadline is not None and time.monotonic() >= deadline:
+                deadline = None
+                run_metadata_pass()
+
+                # The pass rewrites tags and art in the library itself, so
+                # its own events must not retrigger it. Anything that
+                # arrived while it ran (an import landing) schedules
+                # another pass.
+                arrived = False
+                while True:
+                    events = inotify.read(timeout=0)
+                    if not events:
+                        break
+                    arrived = handle_events(inotify, events, wd_map)[1] or arrived
+                if arrived:
+                    print("[WATCHER] Library changed during pass.")
+                    deadline = time.monotonic() + SETTLE_SECONDS
 
         except Exception as e:
             print(f"[WATCHER] ERROR: {e}")
-
-        time.sleep(SLEEP_SECONDS)
+            time.sleep(1)
 
 if __name__ == "__main__":
     main()
@@ -15,72 +15,75 @@ Changes from v7.4:
   Also handle IN_CREATE events for new directories and add watches to them
   dynamically so newly-created subfolders are also watched.
 
-- pipeline_running flag is now checked inside run_pipeline() with a proper
-  guard rather than a bare global read, preventing a subtle race where two
-  debounce timers could both pass the running check before either sets it.
+- Debounce without timer threads: the main loop keeps a deadline and
+  passes the time left to inotify.read(), running the pipeline when a read
+  comes back empty at the deadline. No Timer per event, and since the
+  pipeline runs on the watcher thread two runs can never overlap, so the
+  pipeline_running flag and its lock are gone.
+
+- Adaptive settle: instead of a fixed 180s after the last event, the
+  pipeline runs once the inbox has been quiet for IDLE_GAP seconds and at
+  least MIN_FLOOR seconds have passed since the first event of the burst.
+  Small imports no longer wait out the full window.
+
+- The controller runs in-process: pipeline_controller_v7 is imported once
+  and its main() called on the watcher thread, instead of spawning a new
+  python3 (and re-importing the whole pipeline package) on every trigger.
+  It stays on this thread because PipelineLock times out via SIGALRM.
+  Controller code changes need a watcher restart to take effect.
 """
 
 import os
-import subprocess
 import time
+from collections import deque
 from pathlib import Path
-from threading import Timer, Lock
 from inotify_simple import INotify, flags
 
-INBOX = Path("/inbox")
-SETTLE_SECONDS = 180   # 3 minutes of no changes before running pipeline
-PIPELINE = ["python3", "/app/scripts/pipeline_controller_v7.py"]
+from scripts.pipeline.cleanup import is_audio_name
+from scripts.pipeline_controller_v7 import main as run_controller
 
-# Global debounce timer
-debounce_timer = None
+INBOX = Path("/inbox")
+IDLE_GAP = 30          # seconds of no changes before running pipeline
+MIN_FLOOR = 90         # ...and at least this long since the burst began
+DRAIN_READS = 16       # extra non-blocking reads folded into one event batch
 
-# FIX: Use a Lock to prevent two timers racing through the running check
-_pipeline_lock = Lock()
-pipeline_running = False
+# Per-event and per-watch detail lines; batch summaries are always logged
+VERBOSE = os.getenv("WATCHER_VERBOSE", "false").lower() == "true"
 
+# Event masks as plain ints: event.mask is an int, and int & IntFlag goes
+# through enum's Python-level operators on every event
+_IGNORED = int(flags.IGNORED)
+_Q_OVERFLOW = int(flags.Q_OVERFLOW)
+_ISDIR = int(flags.ISDIR)
+_NEW_ENTRY = int(flags.CREATE | flags.MOVED_TO)
 
 def log(msg):
     ts = time.strftime("%Y-%m-%d %H:%M:%S")
     print(f"[{ts}] {msg}", flush=True)
 
 
-def run_pipeline():
-    global pipeline_running
+def vlog(msg):
+    if VERBOSE:
+        log(msg)
 
-    # FIX: acquire lock before checking/setting the flag to close the race window
-    with _pipeline_lock:
-        if pipeline_running:
-            log("[SKIP] Pipeline already running")
-            return
-        pipeline_running = True
 
+def run_pipeline():
     log("=== Running v7 Pipeline Controller ===")
     try:
-        subprocess.run(PIPELINE, check=True)
+        run_controller()
+    except SystemExit as e:
+        # main() exits non-zero when it can't take the pipeline lock
+        if e.code:
+            log(f"[ERROR] Pipeline exited with status {e.code}")
     except Exception as e:
         log(f"[ERROR] Pipeline failed: {e}")
-    finally:
-        with _pipeline_lock:
-            pipeline_running = False
     log("=== Pipeline Finished ===")
 
 
-def debounce_pipeline():
-    global debounce_timer
-
-    if debounce_timer:
-        debounce_timer.cancel()
-
-    debounce_timer = Timer(SETTLE_SECONDS, run_pipeline)
-    debounce_timer.daemon = True
-    debounce_timer.start()
-    log(f"[DEBOUNCE] Pipeline scheduled in {SETTLE_SECONDS}s")
-
-
-def add_watch(inotify, path: Path, wd_map: dict, watch_flags):
+def add_watch(inotify, path: str, wd_map: dict, watch_flags):
     """Add an inotify watch for path and record it in wd_map."""
     try:
-        wd = inotify.add_watch(str(path), watch_flags)
+        wd = inotify.add_watch(path, watch_flags)
         wd_map[wd] = path
         return wd
     except Exception as e:
@@ -88,21 +91,42 @@ def add_watch(inotify, path: Path, wd_map: dict, watch_flags):
         return None
 
 
+def add_watch_tree(inotify, root: str, wd_map: dict, watch_flags):
+    """
+    Watch root and every directory below it. Breadth-first over
+    os.scandir: one getdents per directory and d_type for is_dir(), all
+    on plain str paths. Used at startup and for directories that appear
+    later, which may already have subdirectories by the time their event
+    is read.
+    """
+    queue = deque([root])
+    while queue:
+        d = queue.popleft()
+        add_watch(inotify, d, wd_map, watch_flags)
+        try:
+            with os.scandir(d) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        queue.append(entry.path)
+        except OSError:
+            continue
+
+
 def main():
     log("=== v7.5 Watcher Started ===")
     log(f"Watching: {INBOX}")
 
     inotify = INotify()
-    watch_flags = (
-        flags.CREATE
-        | flags.MODIFY
-        | flags.MOVED_TO
-        | flags.MOVED_FROM
-        | flags.DELETE
-        | flags.CLOSE_WRITE
-    )
-
-    # wd -> Path mapping so we can resolve which directory an event came from
+    # No MODIFY: it fires on every write() of a growing download. CREATE
+    # marks the start and CLOSE_WRITE the end, which is all the debounce
+    # needs; the controller's own settle check guards long transfers.
+    # No MOVED_FROM/DELETE either: removals never mean new music, and the
+    # pipeline moving albums out would otherwise re-arm the debounce.
+    # IN_IGNORED is always delivered, so wd_map cleanup still works.
+    watch_flags = flags.CREATE | flags.MOVED_TO | flags.CLOSE_WRITE
+
+    # wd -> directory path (str) so we can resolve which directory an
+    # event came from; str keeps Path objects out of the event loop
     wd_map = {}
 
     # FIX: Add watches recursively for all existing subdirectories at startup.
@@ -110,37 +134,110 @@ def main():
     # passed receives events. Previously only /inbox was watched, so file
     # activity inside /inbox/Artist/Album/ was completely invisible.
     INBOX.mkdir(parents=True, exist_ok=True)
-    for dirpath, dirnames, _ in os.walk(str(INBOX)):
-        add_watch(inotify, Path(dirpath), wd_map, watch_flags)
+    add_watch_tree(inotify, str(INBOX), wd_map, watch_flags)
 
     log(f"[WATCH] Watching {len(wd_map)} directories")
 
+    # monotonic time at which the pipeline should run, None when idle;
+    # first_event_at is when the current burst started
+    deadline = None
+    first_event_at = None
+
     while True:
+        if deadline is None:
+            timeout_ms = None
+        else:
+            timeout_ms = max(0, int((deadline - time.monotonic()) * 1000))
+
         try:
-            events = inotify.read(timeout=5000)  # 5 second timeout so we stay responsive
+            events = inotify.read(timeout=timeout_ms)
         except Exception as e:
             log(f"[ERROR] inotify read failed: {e}")
             time.sleep(1)
             continue
 
+        if not events:
+            if deadline is not None and time.monotonic() >= deadline:
+                deadline = None
+                first_event_at = None
+                run_pipeline()
+            continue
+
+        # Pick up whatever else is already queued without blocking, so a
+        # burst is handled as one batch. Capped so a constant stream still
+        # gets its new-directory watches added promptly.
+        for _ in range(DRAIN_READS):
+            try:
+                more = inotify.read(timeout=0)
+            except Exception:
+                break
+            if not more:
+                break
+            events.extend(more)
+
+        # A large unpack can produce thousands of events: log and
+        # reschedule once per batch, not once per event
+        names = set()
+        overflowed = False
         for event in events:
+            # The kernel dropped this watch (its directory was deleted, e.g.
+            # an album moved out by the pipeline): forget the wd so wd_map
+            # only holds live watches
+            mask = event.mask
+            if mask & _IGNORED:
+                wd_map.pop(event.wd, None)
+                continue
+
+            # The kernel's event queue filled up (likely while a long
+            # pipeline run held this thread) and events were lost: new
+            # directories may be unwatched, and anything may have changed
+            if mask & _Q_OVERFLOW:
+                overflowed = True
+                continue
+
             name = event.name or ""
 
             # Ignore hidden/system files
             if name.startswith("."):
                 continue
 
-            # FIX: If a new directory was created, add a watch for it
-            # so files placed inside it are also observed.
-            if event.mask & flags.CREATE and event.mask & flags.ISDIR:
-                parent = wd_map.get(event.wd)
-                if parent:
-                    new_dir = parent / name
-                    add_watch(inotify, new_dir, wd_map, watch_flags)
-                    log(f"[WATCH] Added watch for new dir: {new_dir} (total: {len(wd_map)})")
-
-            log(f"[EVENT] {name} (mask={event.mask:#010x})")
-            debounce_pipeline()
+            # FIX: If a new directory was created (or moved in), watch it
+            # and anything already created beneath it (mkdir -p, or a
+            # finished download moved into place) so files placed inside
+            # are also observed.
+            if mask & _ISDIR:
+                if mask & _NEW_ENTRY:
+                    parent = wd_map.get(event.wd)
+                    if parent:
+                        new_dir = os.path.join(parent, name)
+                        add_watch_tree(inotify, new_dir, wd_map, watch_flags)
+                        vlog(f"[WATCH] Added watch for new dir: {new_dir} (total: {len(wd_map)})")
+            else:
+                # Only files the controller would import can matter; .part,
+                # .nfo, .jpg, .sfv and other sidecars are skipped before any
+                # logging or debouncing
+                if not is_audio_name(name):
+                    continue
+
+            if VERBOSE:
+                vlog(f"[EVENT] {name} (mask={mask:#010x})")
+            names.add(name)
+
+        if overflowed:
+            log("[WATCH] Event queue overflowed, rescanning inbox")
+            add_watch_tree(inotify, str(INBOX), wd_map, watch_flags)
+            log(f"[WATCH] Watching {len(wd_map)} directories")
+
+        if names or overflowed:
+            if len(names) == 1:
+                log(f"[EVENT] {next(iter(names))}")
+            elif names:
+                log(f"[EVENT] {len(names)} changed entries, e.g. {min(names)}")
+            now = time.monotonic()
+            if first_event_at is None:
+                first_event_at = now
+            deadline = max(now + IDLE_GAP, first_event_at + MIN_FLOOR)
+            log(f"[DEBOUNCE] Pipeline scheduled in {deadline - now:.0f}s")
 
 
 if __name__ == "__main__":
@@ -5,32 +5,52 @@ SLSKD API Connection Test Script
 Tests the SLSKD API endpoint with proper authentication
 """
 
+import os
 import requests
 import json
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
-# Your SLSKD configuration
-SLSKD_API_KEY = "PV1RixwWGOi91oVYfSMhd7JNVy1hj6jpcBOcdM+z1mKB+JnIQ2c4nwVWLgYi2JHd"
-SLSKD_HOST = "http://10.0.0.100:5030"
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+# SLSKD configuration, same environment variables as pipeline/slskd.py
+SLSKD_API_KEY = os.getenv("SLSKD_API_KEY", "")
+SLSKD_HOST = os.getenv("SLSKD_HOST", "http://10.0.0.100:5030")
 
 def test_slskd_connection():
     """Test SLSKD API connectivity and authentication"""
+    # One session for all probes: they share the auth header and the
+    # connection pool instead of each setting up their own
+    with requests.Session() as session, ThreadPoolExecutor(max_workers=3) as ex:
+        session.headers.update({"X-API-Key": SLSKD_API_KEY})
+        # The three endpoints are independent: request them all at once
+        # and report in order, so the run takes one round trip, not three
+        pending = {
+            path: ex.submit(session.get, f"{SLSKD_HOST}{path}",
+                            timeout=10, stream=(path == "/api/v0/transfers"))
+            for path in ("/api/v0/application", "/api/v0/transfers", "/api/v0/session")
+        }
+        return run_probes(pending)
+
+def run_probes(pending):
+    """Report on the endpoint checks; pending maps path -> response future"""
     
     print("=" * 60)
     print("SLSKD API Connection Test")
     print("=" * 60)
     
-    headers = {"X-API-Key": SLSKD_API_KEY}
-    
     # Test 1: Application endpoint
     print("\n[TEST 1] Testing /api/v0/application endpoint...")
     try:
         url = f"{SLSKD_HOST}/api/v0/application"
         print(f"URL: {url}")
         
-        response = requests.get(url, headers=headers, timeout=10)
+        response = pending["/api/v0/application"].result()
         print(f"Status Code: {response.status_code}")
-        print(f"Headers: {dict(response.headers)}")
         
         if response.status_code == 200:
             print("✓ SUCCESS - Application endpoint working")
@@ -60,21 +80,35 @@ def test_slskd_connection():
         url = f"{SLSKD_HOST}/api/v0/transfers"
         print(f"URL: {url}")
         
-        response = requests.get(url, headers=headers, timeout=10)
+        # Streamed so a long transfer history is counted one entry at a
+        # time instead of being parsed into one big list first
+        response = pending["/api/v0/transfers"].result()
         print(f"Status Code: {response.status_code}")
         
         if response.status_code == 200:
             print("✓ SUCCESS - Transfers endpoint working")
-            data = response.json()
-            print(f"Found {len(data)} transfers")
+            if IJSON_AVAILABLE:
+                response.raw.decode_content = True
+                transfers = ijson.items(response.raw, "item")
+            else:
+                transfers = response.json()
             
-            # Show active transfers
-            active = [t for t in data if t.get("state") not in ("completed", "succeeded")]
-            print(f"Active transfers: {len(active)}")
+            # Count everything, keep only the first 5 active for display
+            total = 0
+            active_count = 0
+            active = []
+            for t in transfers:
+                total += 1
+                if t.get("state") not in ("completed", "succeeded"):
+                    active_count += 1
+                    if len(active) < 5:
+                        active.append(t)
+            print(f"Found {total} transfers")
+            print(f"Active transfers: {active_count}")
             
             if active:
                 print("\nActive transfer details:")
-                for t in active[:5]:  # Show first 5
+                for t in active:  # Show first 5
                     print(f"  - {t.get('username', 'Unknown')}: {t.get('filename', 'Unknown')}")
                     print(f"    State: {t.get('state', 'Unknown')}")
                     print(f"    Progress: {t.get('bytesTransferred', 0)}/{t.get('size', 0)} bytes")
@@ -94,8 +128,7 @@ def test_slskd_connection():
     # Test 3: Session endpoint
     print("\n[TEST 3] Testing /api/v0/session endpoint...")
     try:
-        url = f"{SLSKD_HOST}/api/v0/session"
-        response = requests.get(url, headers=headers, timeout=10)
+        response = pending["/api/v0/session"].result()
         print(f"Status Code: {response.status_code}")
         
         if response.status_code == 200:
@@ -115,6 +148,9 @@ def test_slskd_connection():
     return True
 
 if __name__ == "__main__":
+    if not SLSKD_API_KEY:
+        print("SLSKD_API_KEY is not set")
+        sys.exit(1)
     try:
         success = test_slskd_connection()
         sys.exit(0 if success else 1)